@@ -0,0 +1,354 @@
+import argparse
+from dataclasses import dataclass
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from characters import EVENT_RATES, Applicant, Company, Employee
+from person import Person
+
+# Times the day loop's building blocks at several roster sizes:
+#
+#     python bench.py --save baseline.json
+#     python bench.py --compare baseline.json
+#
+# Each benchmark is a `setup` that runs untimed before every call (e.g. to
+# draw a fresh event to apply) and the operation being measured. Latency is
+# measured without tracing; allocations and peak memory come from a separate
+# pass under `tracemalloc`, since tracing slows everything down.
+
+SIZES = [10, 1_000, 10_000, 100_000]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # Given the company, returns the arguments for `run`, or `None` if the
+    # operation can't happen right now (e.g. no event of the kind is possible).
+    setup: Callable[[Company], Optional[tuple]]
+    run: Callable[..., Any]
+
+
+@dataclass
+class Measurement:
+    iterations: int
+    median_us: float
+    mean_us: float
+    # Net Python objects (allocator blocks) still alive after one call, and
+    # the bytes allocated at the high-water mark during it.
+    blocks: int
+    allocated_bytes: int
+    peak_bytes: int
+
+    def to_json(self) -> dict:
+        return self.__dict__.copy()
+
+
+def benchmarks() -> list[Benchmark]:
+    out = [
+        Benchmark("Person.generate", _rng, Person.generate),
+        Benchmark("Employee.generate", _rng, Employee.generate),
+        Benchmark("Applicant.generate", _rng, Applicant.generate),
+        Benchmark("Company.generate", _nothing, lambda: Company.generate()),
+        Benchmark("Company.hire", _applicant, _hire),
+        Benchmark("Company.start_of_day", _company, Company.start_of_day),
+        Benchmark(
+            "Company.create_todays_schedule",
+            _company,
+            Company.create_todays_schedule,
+        ),
+        Benchmark("Company.end_of_day", _company, Company.end_of_day),
+        Benchmark("Company.end_of_week", _company, Company.end_of_week),
+    ]
+    for kind in EVENT_RATES.kinds:
+        name = kind.__name__
+        out += [
+            Benchmark(f"{name}.generate", _company, kind.generate),
+            Benchmark(f"{name}.described_by_to", _described(kind), _describe),
+            # Last, since applying some events uses up who they can happen to.
+            Benchmark(f"{name}.apply", _event(kind), lambda e, c: e.apply(c)),
+        ]
+    return out
+
+
+def company_of_size(n: int, seed: int = 0) -> Company:
+    c = Company.generate(seed)
+    for e in Employee.generate_many(max(0, n - len(c.employees)), c.np_rng):
+        c.hire(e, start_delay=0)
+
+    # Give everyone feelings about a couple of nearby coworkers, both ways,
+    # and make some of them unhappy, so events that depend on who likes or
+    # hates whom have someone to pick.
+    roster, rng = c.roster, c.np_rng
+    rows = roster.rows_of(c.employees)
+    for i, j, there, back in zip(
+        np.repeat(rows, 2).tolist(),
+        rows[
+            (np.repeat(np.arange(len(rows)), 2) + rng.integers(1, 50, 2 * len(rows)))
+            % len(rows)
+        ].tolist(),
+        rng.uniform(-1, 1, 2 * len(rows)).tolist(),
+        rng.uniform(-1, 1, 2 * len(rows)).tolist(),
+    ):
+        if i != j:
+            roster.relationships.set(i, j, there)
+            roster.relationships.set(j, i, back)
+    unhappy = rows[rng.random(len(rows)) < 0.1]
+    roster.disposition_toward_company[unhappy] = rng.uniform(-1, 0, len(unhappy))
+    roster.changed("disposition_toward_company")
+
+    c.start_of_day()
+    return c
+
+
+def measure(
+    c: Company,
+    n: int,
+    benchmark: Benchmark,
+    min_seconds: float = 0.2,
+    max_iterations: int = 1000,
+) -> Optional[Measurement]:
+    # One traced call first, then as many timed calls as fit in
+    # `min_seconds`, or until the operation stops being possible (e.g. there
+    # is nobody left who hates a coworker enough to quit).
+    args = _ready(c, n, benchmark)
+    if args is None:
+        return None
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    result = benchmark.run(*args)
+    blocks = sys.getallocatedblocks() - blocks
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    total = 0.0
+    while total < min_seconds and len(times) < max_iterations:
+        args = _ready(c, n, benchmark)
+        if args is None:
+            break
+        start = time.perf_counter_ns()
+        benchmark.run(*args)
+        elapsed = time.perf_counter_ns() - start
+        times.append(elapsed / 1000)
+        total += elapsed / 1e9
+    if not times:
+        return None
+
+    return Measurement(
+        iterations=len(times),
+        median_us=statistics.median(times),
+        mean_us=statistics.fmean(times),
+        blocks=blocks,
+        allocated_bytes=allocated,
+        peak_bytes=peak,
+    )
+
+
+def run(
+    sizes: list[int],
+    only: Optional[str] = None,
+    min_seconds: float = 0.2,
+    progress: bool = False,
+) -> dict:
+    results: dict[str, dict[str, Optional[dict]]] = {}
+    for n in sizes:
+        start = time.perf_counter()
+        c = company_of_size(n)
+        if progress:
+            print(f"{n} employees: set up in {time.perf_counter() - start:.1f}s")
+        results[str(n)] = {}
+        for benchmark in benchmarks():
+            if only is not None and only not in benchmark.name:
+                continue
+            m = measure(c, n, benchmark, min_seconds)
+            results[str(n)][benchmark.name] = None if m is None else m.to_json()
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def print_results(report: dict, baseline: Optional[dict] = None):
+    for n, results in report["results"].items():
+        print()
+        print(f"{n} EMPLOYEES")
+        print("-" * (len(n) + 10))
+        header = f"{'Operation':<40}{'median':>11}{'mean':>11}{'blocks':>9}{'peak':>11}"
+        if baseline is not None:
+            header += f"{'vs base':>9}"
+        print(header)
+        for name, m in results.items():
+            if m is None:
+                print(f"{name:<40}{'(not possible)':>42}")
+                continue
+            line = (
+                f"{name:<40}{_us(m['median_us']):>11}{_us(m['mean_us']):>11}"
+                f"{m['blocks']:>9}{_bytes(m['peak_bytes']):>11}"
+            )
+            ratio = _ratio(baseline, n, name, m)
+            if ratio is not None:
+                line += f"{ratio:>8.2f}x"
+            print(line)
+
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    # Operations whose median got more than `tolerance` times slower.
+    found = []
+    for n, results in report["results"].items():
+        for name, m in results.items():
+            ratio = _ratio(baseline, n, name, m)
+            if ratio is not None and ratio > tolerance:
+                found.append(f"{name} at {n} employees: {ratio:.2f}x slower")
+    return found
+
+
+def _ratio(baseline: Optional[dict], n: str, name: str, m: Optional[dict]):
+    if baseline is None or m is None:
+        return None
+    old = baseline["results"].get(n, {}).get(name)
+    if not old:
+        return None
+    return m["median_us"] / old["median_us"]
+
+
+def _us(us: float) -> str:
+    if us >= 1000:
+        return f"{us / 1000:.2f}ms"
+    return f"{us:.1f}us"
+
+
+def _bytes(n: int) -> str:
+    if n >= 1 << 20:
+        return f"{n / (1 << 20):.1f}MiB"
+    return f"{n / 1024:.1f}KiB"
+
+
+def _ready(c: Company, n: int, benchmark: Benchmark) -> Optional[tuple]:
+    # Undo the drift from earlier calls (quits, call-outs, hours piling up)
+    # so every call sees a full roster and a staffed shift.
+    while len(c.employees) < n:
+        c.hire(Employee.generate(c.rng))
+    if len(c.scheduled_today) < min(n, c.min_shift_size):
+        for e in list(c.cant_be_scheduled_for_days):
+            c.cant_be_scheduled_for_days[e] = 0
+        c.end_of_week()
+        c.create_todays_schedule()
+    return benchmark.setup(c)
+
+
+def _nothing(c: Company) -> tuple:
+    return ()
+
+
+def _rng(c: Company) -> tuple:
+    return (c.rng,)
+
+
+def _company(c: Company) -> tuple:
+    return (c,)
+
+
+def _applicant(c: Company) -> tuple:
+    return c, Applicant.generate(c.rng)
+
+
+def _hire(c: Company, applicant: Applicant):
+    c.hire(
+        applicant.employee,
+        start_delay=applicant.start_delay,
+        desired_workdays=applicant.workdays,
+    )
+
+
+def _event(kind) -> Callable[[Company], Optional[tuple]]:
+    def setup(c: Company) -> Optional[tuple]:
+        for _ in range(10):
+            e = kind.generate(c)
+            if isinstance(e, kind):
+                return e, c
+        return None
+
+    return setup
+
+
+def _described(kind) -> Callable[[Company], Optional[tuple]]:
+    def setup(c: Company) -> Optional[tuple]:
+        found = _event(kind)(c)
+        if found is None or len(c.employees) < 2:
+            return None
+        e, _ = found
+        speaker = c.employees.choice(c.rng)
+        return e, speaker, c.employees.choice_excluding(speaker, c.rng), c.rng
+
+    return setup
+
+
+def _describe(e, speaker: Employee, listener: Employee, rng) -> str:
+    return e.described_by_to(speaker, listener, rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the day loop's operations at several roster sizes."
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=SIZES,
+        help="roster sizes to benchmark at",
+    )
+    parser.add_argument("--only", help="only run benchmarks with this in their name")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="seconds to spend timing each operation",
+    )
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compare against saved results"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="with --compare, fail if anything is this many times slower",
+    )
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.only, args.min_time, progress=True)
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+
+    if args.save is not None:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        found = regressions(report, baseline, args.tolerance)
+        if found:
+            print()
+            print("REGRESSIONS")
+            print("-----------")
+            for line in found:
+                print(line)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
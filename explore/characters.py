@@ -2,61 +2,113 @@ from abc import ABC, abstractmethod
 from collections import defaultdict, namedtuple
 from dataclasses import dataclass, field
 from enum import Enum
+import inspect
 import random
-from typing import Optional
-
-from person import Person
+from typing import Callable, ClassVar, Optional
+
+import numpy as np
+
+from dialogue import Dialogue, Line
+from event_log import EventLog
+from event_rates import EventRate, EventRegistry
+from indexed_set import IndexedSet
+from leave import LeaveCalendar, LeaveView
+from metrics import Metrics, measured
+from name_index import NameIndex
+from person import NicknamePool, Person, Trait, draw_people, traits_for_code
+from population import Population
+from roster import (
+    DISLIKES,
+    HATES,
+    LIKES,
+    ColumnView,
+    RelationshipsView,
+    Roster,
+    RosterField,
+)
+from rumors import Rumors
+from scheduling import NeediestFirst, SchedulingPolicy
+from streams import Seed, company_rngs
 
 
 def main():
     c = Company.generate()
     c.day_of_week = 5
     while True:
-        print("\n" * 3)
-        print(day_of_week(c.day_of_week))
-        print("----------")
+        if start_day(c):
+            menu(c)
+            play_events(c, confirm)
+        end_day(c)
 
-        c.start_of_day()
+        menu(c)
 
-        if not c.scheduled_today:
-            print("No one could be scheduled to work today!")
-        else:
-            print("Scheduled today:")
-            for employee in c.scheduled_today:
-                print(f"\t- {employee.full_name()}")
+        if c.day_of_week == 0:
+            c.end_of_week().print()
+            confirm()
 
-            menu(c)
 
-            print()
-            events = random.choices(Event.__subclasses__(), k=random.randint(0, 3))
-            for event_kind in events:
-                e = event_kind.generate(c)
-                e.print()
-                e.apply(c)
-                c.event_history[-1].append(e)
-                confirm()
-
-            if len(events) == 0:
-                print(
-                    random.choice(
-                        [
-                            "The day went by smoothly.",
-                            "The day was uneventful.",
-                            "Nothing out of the ordinary happened today.",
-                        ]
-                    )
-                )
-                confirm()
+# The day's steps, split up so they can also be driven by something other than
+# `input()` (see `server.py`).
 
-        total_labor_hours = c.end_of_day()
-        print()
-        print(f"Today's productivity: {total_labor_hours} labor hours")
 
-        menu(c)
+def start_day(c: "Company") -> bool:
+    # Whether anyone is working today.
+    print("\n" * 3)
+    print(day_of_week(c.day_of_week))
+    print("----------")
 
-        if c.day_of_week == 0:
-            c.end_of_week()
-            confirm()
+    c.start_of_day()
+    if c.understaffed:
+        print_understaffed()
+
+    if not c.scheduled_today:
+        print("No one could be scheduled to work today!")
+        return False
+    print("Scheduled today:")
+    for employee in c.scheduled_today:
+        print(f"\t- {employee.full_name()}")
+    return True
+
+
+def play_events(c: "Company", pause: Callable[[], None]):
+    print()
+    events = roll_event_kinds(c)
+
+    def happened(e: "Event"):
+        e.print()
+        pause()
+
+    c.run_events(events, happened)
+
+    if len(events) == 0:
+        print(
+            c.rng.choice(
+                [
+                    "The day went by smoothly.",
+                    "The day was uneventful.",
+                    "Nothing out of the ordinary happened today.",
+                ]
+            )
+        )
+        pause()
+
+
+def end_day(c: "Company"):
+    total_labor_hours = c.end_of_day()
+    print()
+    print(f"Today's productivity: {total_labor_hours} labor hours")
+
+
+def roll_event_kinds(c: "Company") -> list[type["Event"]]:
+    return EVENT_RATES.roll(c, c.np_rng)
+
+
+def print_understaffed():
+    print()
+    print(">>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>")
+    print("Understaffed!")
+    print(">>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>")
+    print()
 
 
 def confirm():
@@ -67,58 +119,83 @@ def confirm():
 
 def menu(c: "Company"):
     while True:
-        print()
-        print("OPTIONS")
-        print("-------")
-        print("    [D]ebug <NAME> - Print debug info for a person")
-        print("    [T]alk <NAME> - Talk to an employee about recent events")
-        print("    [L]isten - Listen to the latest gossip")
-        print("    [H]iring - Go to hiring menu")
-        print("    [E]mployees - List current employees")
-        print("    [ENTER] - Continue")
-        match input("> ").split(" "):
-            case [] | [""]:
+        print_options()
+        match parse_command(input("> ")):
+            case ("continue", _):
                 break
-            case ["h" | "H" | "hiring"]:
+            case ("hiring", _):
                 hiring_menu(c)
-            case ["t" | "T" | "talk", name]:
-                talk_menu(c, name)
-            case ["l" | "L" | "listen"]:
-                listen_menu(c)
-            case ["d" | "D" | "debug", name]:
-                for employee in c.employees:
-                    if (
-                        (employee.nickname or "").lower() == name.lower()
-                        or employee.first_name.lower() == name.lower()
-                        or employee.last_name.lower() == name.lower()
-                    ):
-                        print(repr(employee))
-                        break
-                else:
-                    print("Employee not found.")
-            case ["e" | "E" | "employees"]:
-                print()
-                print("CURRENT EMPLOYEES")
-                print("-----------------")
-                for employee in c.employees:
-                    bullet = (
-                        "*"
-                        if employee in c.scheduled_today
-                        else "x" if c.cant_be_scheduled_for_days[employee] > 0 else "-"
-                    )
-                    days_till = (
-                        f"(Out for {c.cant_be_scheduled_for_days[employee]} days)"
-                        if c.cant_be_scheduled_for_days[employee] > 0
-                        else ""
-                    )
-                    wage = employee.hourly_wage
-                    print(
-                        f"\t{bullet} {employee.full_name():<25}{wage:>5.2f}/hr{days_till:>20}"
-                    )
-                print("* Scheduled today")
-                print("x Can't be scheduled for a few days")
-            case _:
-                print("Invalid command.")
+            case (command, name):
+                run_command(c, command, name)
+
+
+def print_options():
+    print()
+    print("OPTIONS")
+    print("-------")
+    print("    [D]ebug <NAME> - Print debug info for a person")
+    print("    [T]alk <NAME> - Talk to an employee about recent events")
+    print("    [L]isten - Listen to the latest gossip")
+    print("    [H]iring - Go to hiring menu")
+    print("    [E]mployees - List current employees")
+    print("    [ENTER] - Continue")
+
+
+def parse_command(line: str) -> tuple[str, Optional[str]]:
+    # The command and, for those that take one, the name it was given.
+    match line.split(" "):
+        case [] | [""]:
+            return "continue", None
+        case ["h" | "H" | "hiring"]:
+            return "hiring", None
+        case ["t" | "T" | "talk", *name] if name:
+            return "talk", " ".join(name)
+        case ["l" | "L" | "listen"]:
+            return "listen", None
+        case ["d" | "D" | "debug", *name] if name:
+            return "debug", " ".join(name)
+        case ["e" | "E" | "employees"]:
+            return "employees", None
+        case _:
+            return "invalid", None
+
+
+def run_command(c: "Company", command: str, name: Optional[str] = None):
+    # Any command but "continue" and "hiring", which depend on who's asking.
+    match command:
+        case "talk":
+            talk_menu(c, name)
+        case "listen":
+            listen_menu(c)
+        case "debug":
+            employee = find_employee(c, name)
+            if employee is not None:
+                print(repr(employee))
+        case "employees":
+            employees_menu(c)
+        case _:
+            print("Invalid command.")
+
+
+def employees_menu(c: "Company"):
+    print()
+    print("CURRENT EMPLOYEES")
+    print("-----------------")
+    for employee in c.employees:
+        bullet = (
+            "*"
+            if employee in c.scheduled_today
+            else "x" if c.cant_be_scheduled_for_days[employee] > 0 else "-"
+        )
+        days_till = (
+            f"(Out for {c.cant_be_scheduled_for_days[employee]} days)"
+            if c.cant_be_scheduled_for_days[employee] > 0
+            else ""
+        )
+        wage = employee.hourly_wage
+        print(f"\t{bullet} {employee.full_name():<25}{wage:>5.2f}/hr{days_till:>20}")
+    print("* Scheduled today")
+    print("x Can't be scheduled for a few days")
 
 
 @dataclass
@@ -135,127 +212,153 @@ class Applicant:
         return self.employee == value.employee
 
     @staticmethod
-    def generate():
-        e = Employee.generate()
+    def generate(rng: random.Random):
+        e = Employee.generate(rng)
         max_delay = 5
-        start_delay = random.randint(0, max_delay)
+        start_delay = rng.randint(0, max_delay)
         sign_on_bonus = max(
-            random.normalvariate(7.50, 1.0) * (1 - (start_delay + 1) / max_delay) * 4,
+            rng.normalvariate(7.50, 1.0) * (1 - (start_delay + 1) / max_delay) * 4,
             0,
         )
         return Applicant(
             employee=e,
             start_delay=start_delay,
-            workdays=random.randint(2, 6),
+            workdays=rng.randint(2, 6),
             sign_on_bonus=round(sign_on_bonus) / 4,
         )
 
 
 def hiring_menu(c: "Company"):
-    n_applicants = random.randint(1, 6)
-    pool = [Applicant.generate() for _ in range(n_applicants)]
+    pool = start_hiring(c)
+    while hiring_command(c, pool, input("> ")):
+        pass
+
+
+def start_hiring(c: "Company") -> list[Applicant]:
+    n_applicants = c.rng.randint(1, 6)
+    pool = [Applicant.generate(c.rng) for _ in range(n_applicants)]
 
     print()
     print()
     print("HIRING")
     print("------")
+    print_applicants(pool)
+    return pool
 
-    while True:
-        print()
-        print("Applicants")
-        print("-----------")
-        if pool:
-            for i, applicant in enumerate(pool):
-                employee = applicant.employee
-                start_delay = applicant.start_delay
-                workdays = applicant.workdays
-                sign_on_bonus = applicant.sign_on_bonus
-
-                start_when = (
-                    "TODAY"
-                    if start_delay == 0
-                    else "tomorrow" if start_delay == 1 else f"in {start_delay} days"
-                )
-                sex = employee.sex_descriptor()
-                workdays = random.randint(2, 6)
-                print()
-                print(f"{i + 1}. {employee.full_name()}, {employee.age} -- Sex: {sex}")
-                print(f"    - Desired wage: {employee.hourly_wage:2.2f}/hr")
-                print(f"    - Wants to work {workdays} days per week")
-                print(f"    - Can start {start_when}")
-                if sign_on_bonus > 0:
-                    print(f"    - Requested sign-on bonus: {sign_on_bonus:3.2f}")
+
+def print_applicants(pool: list[Applicant]):
+    print()
+    print("Applicants")
+    print("-----------")
+    if pool:
+        for i, applicant in enumerate(pool):
+            employee = applicant.employee
+            start_delay = applicant.start_delay
+            workdays = applicant.workdays
+            sign_on_bonus = applicant.sign_on_bonus
+
+            start_when = (
+                "TODAY"
+                if start_delay == 0
+                else "tomorrow" if start_delay == 1 else f"in {start_delay} days"
+            )
+            sex = employee.sex_descriptor()
+            print()
+            print(f"{i + 1}. {employee.full_name()}, {employee.age} -- Sex: {sex}")
+            print(f"    - Desired wage: {employee.hourly_wage:2.2f}/hr")
+            print(f"    - Wants to work {workdays} days per week")
+            print(f"    - Can start {start_when}")
+            if sign_on_bonus > 0:
+                print(f"    - Requested sign-on bonus: {sign_on_bonus:3.2f}")
+    else:
+        print("No applicants.")
+    print()
+    print(f"E[x]it hiring menu")
+    print()
+
+
+def hiring_command(c: "Company", pool: list[Applicant], inp: str) -> bool:
+    # Whether to stay in the hiring menu.
+    try:
+        idx = int(inp) - 1
+        if 0 <= idx < len(pool):
+            applicant = pool[idx]
+            e = applicant.employee
+            start_delay = applicant.start_delay
+            workdays = applicant.workdays
+
+            pool.remove(applicant)
+            c.hire(e, start_delay=start_delay, desired_workdays=workdays)
+
+            start_when = f"in {start_delay} days" if start_delay > 0 else "tomorrow"
+            print()
+            print(f"{e.full_name()} is hired. {e.They} can start {start_when}.")
         else:
-            print("No applicants.")
-        print()
-        print(f"E[x]it hiring menu")
-        print()
-        inp = input("> ")
-        try:
-            idx = int(inp) - 1
-            if 0 <= idx < len(pool):
-                applicant = pool[idx]
-                e = applicant.employee
-                start_delay = applicant.start_delay
-                workdays = applicant.workdays
-
-                pool.remove(applicant)
-                c.hire(e, start_delay=start_delay, desired_workdays=workdays)
-
-                start_when = f"in {start_delay} days" if start_delay > 0 else "tomorrow"
-                print()
-                print(f"{e.full_name()} is hired. {e.They} can start {start_when}.")
-            else:
+            print()
+            print(f"Invalid index. Please enter a number between 1 and {len(pool)}.")
+    except ValueError:
+        match inp.lower():
+            case "x" | "exit":
                 print()
-                print(
-                    f"Invalid index. Please enter a number between 1 and {len(pool)}."
-                )
-        except ValueError:
-            match inp.lower():
-                case "x" | "exit":
-                    print()
-                    print("Redoing schedule...")
-                    c.create_todays_schedule()
-                    print("Scheduled today:")
-                    for employee in c.scheduled_today:
-                        print(f"\t- {employee.full_name()}")
-                    break
-                case _:
-                    print("Invalid input.")
-                    continue
+                print("Redoing schedule...")
+                c.create_todays_schedule()
+                if c.understaffed:
+                    print_understaffed()
+                print("Scheduled today:")
+                for employee in c.scheduled_today:
+                    print(f"\t- {employee.full_name()}")
+                return False
+            case _:
+                print("Invalid input.")
+    print_applicants(pool)
+    return True
+
+
+def find_employee(c: "Company", name: str) -> Optional["Employee"]:
+    matches = c.name_index.find(name)
+    match matches:
+        case []:
+            print("Employee not found.")
+            return None
+        case [employee]:
+            return employee
+        case _:
+            print(f"Which one? '{name}' could be:")
+            for employee in matches:
+                print(f"\t- {employee.full_name()}")
+            return None
 
 
 def talk_menu(c: "Company", name: str):
-    e = None
-    for employee in c.employees:
-        if (
-            (employee.nickname or "").lower() == name.lower()
-            or employee.first_name.lower() == name.lower()
-            or employee.last_name.lower() == name.lower()
-        ):
-            e = employee
-            break
-    else:
-        print("Employee not found.")
+    e = find_employee(c, name)
+    if e is None:
         return
 
     print()
     print(f"TALKING TO {e}")
     print("-------------------------------")
     try:
-        event = random.choice(c.event_history[-1])
-        dummy = Employee.generate()
-        print(event.described_by_to(e, dummy))
+        event = c.rng.choice(c.rumors.heard_by(e) or c.event_log.todays_events)
+        dummy = Employee.generate(c.rng)
+        print(event.described_by_to(e, dummy, c.rng))
     except IndexError:
-        e.print_uneventful_day()
+        e.print_uneventful_day(c.rng)
 
 
 def listen_menu(c: "Company"):
-    [e1, e2] = random.sample(list(c.employees), 2)
+    overheard = c.rumors.overheard(c.rng)
+    if overheard is not None:
+        event, e1, e2 = overheard
+    elif len(c.employees) < 2:
+        print("There's nobody around to listen in on.")
+        return
+    else:
+        [e1, e2] = c.employees.sample(2, c.rng)
     try:
-        event = random.choice(c.event_history[-1])
-        d1 = event.described_by_to(e1, e2)
-        d2 = event.described_by_to(e2, e1)
+        if overheard is None:
+            event = c.rng.choice(c.event_log.todays_events)
+        d1 = event.described_by_to(e1, e2, c.rng)
+        d2 = event.described_by_to(e2, e1, c.rng)
         if d1 != d2:
             print()
             print(f"{e1}: {d1}")
@@ -268,9 +371,9 @@ def listen_menu(c: "Company"):
     except IndexError:
         print()
         print(f"{e1}: ", end="")
-        e1.print_uneventful_day()
+        e1.print_uneventful_day(c.rng)
         print(f"{e2}: ", end="")
-        e2.print_uneventful_day()
+        e2.print_uneventful_day(c.rng)
 
 
 def day_of_week(dow: int) -> str:
@@ -287,45 +390,75 @@ def day_of_week(dow: int) -> str:
 
 @dataclass
 class Employee(Person):
-    hourly_wage: float = field(default_factory=lambda: random.normalvariate(0.17, 0.03))
-    disposition_toward_company: float = 0.8
-    relationships: defaultdict["Employee", float] = field(
-        default_factory=lambda: defaultdict(float)
-    )
+    age: int = RosterField()
+    traits: Trait = RosterField(kind=traits_for_code)
+    hourly_wage: float = RosterField(default=0.17)  # What `generate` draws around.
+    disposition_toward_company: float = RosterField(default=0.8)
 
-    def __hash__(self):
-        return super().__hash__()
+    # Set while the employee is on a company's roster.
+    _roster = None
+    _row = -1
 
-    def __eq__(self, value: "Employee"):
-        return super().__eq__(value)
+    # Redefined so `@dataclass` doesn't replace `Person`'s id-based versions.
+    __hash__ = Person.__hash__
+    __eq__ = Person.__eq__
+
+    @property
+    def relationships(self) -> RelationshipsView:
+        return RelationshipsView(self)
 
     def __repr__(self):
-        relationships = {str(k): v for k, v in self.relationships.items()}
+        relationships = {str(k): round(v, 2) for k, v in self.relationships.items()}
         return f'Employee("{self.full_name()}", age={self.age}, disposition_toward_company={self.disposition_toward_company:2.1f}, traits={self.traits}, relationships={relationships})'
 
     @staticmethod
-    def generate():
-        p = Person.generate()
-        e = Employee(disposition_toward_company=random.uniform(0.5, 1.0), **p.__dict__)
+    def generate(rng: random.Random):
+        p = Person.generate(rng)
+        e = Employee(
+            hourly_wage=rng.normalvariate(0.17, 0.03),
+            disposition_toward_company=rng.uniform(0.5, 1.0),
+            **p.__dict__,
+        )
         return e
 
+    @staticmethod
+    def generate_many(n: int, rng: np.random.Generator) -> list["Employee"]:
+        wages = rng.normal(0.17, 0.03, size=n).tolist()
+        dispositions = rng.uniform(0.5, 1.0, size=n).tolist()
+        return [
+            Employee(
+                first_name,
+                last_name,
+                age,
+                traits,
+                id=person_id,
+                hourly_wage=wage,
+                disposition_toward_company=disposition,
+            )
+            for (
+                first_name,
+                last_name,
+                age,
+                traits,
+                person_id,
+            ), wage, disposition in zip(draw_people(n, rng), wages, dispositions)
+        ]
+
     def likes(self, other: "Employee") -> bool:
-        return self.relationships[other] > 0.5
+        return self.relationships[other] > LIKES
 
     def dislikes(self, other: "Employee") -> bool:
-        return self.relationships[other] < -0.1
+        return self.relationships[other] < DISLIKES
 
     def hates(self, other: "Employee") -> bool:
-        return self.relationships[other] < -0.8
+        return self.relationships[other] < HATES
 
-    def print_uneventful_day(self):
+    def print_uneventful_day(self, rng: random.Random):
         if self.disposition_toward_company > 0.8:
-            print(
-                random.choice(["'Another day, another dime.'", "'Just another day.'"])
-            )
+            print(rng.choice(["'Another day, another dime.'", "'Just another day.'"]))
         elif self.disposition_toward_company < -0.8:
             print(
-                random.choice(
+                rng.choice(
                     [
                         "'I gotta get the hell out of this job.'",
                         "'Each day's worse than the last. See you tomorrow.'",
@@ -335,7 +468,7 @@ class Employee(Person):
             )
         else:
             print(
-                random.choice(
+                rng.choice(
                     [
                         "'Today was same as yesterday.'",
                         "'What can I say. Just another day.'",
@@ -347,48 +480,76 @@ class Employee(Person):
             )
 
 
+def _on_shift(args: tuple, result) -> int:
+    return len(args[0].scheduled_today)
+
+
 @dataclass
 class Company:
-    employees: set[Employee]
-    scheduled_today: set[Employee]
-    cant_be_scheduled_for_days: defaultdict[Employee, int]
-    desired_workdays_per_week: dict[Employee, int]
-    event_history: list[list["Event"]] = field(default_factory=list)
-
-    weekly_hours_worked: defaultdict[Employee, int] = field(
-        default_factory=lambda: defaultdict(int)
+    employees: IndexedSet[Employee] = field(default_factory=IndexedSet)
+    scheduled_today: IndexedSet[Employee] = field(default_factory=IndexedSet)
+    event_log: EventLog = field(default_factory=lambda: EventLog(EVENT_RATES.kinds))
+
+    roster: Roster = field(default_factory=Roster)
+    employees_by_first_name: defaultdict[str, set[Employee]] = field(
+        default_factory=lambda: defaultdict(set)
     )
+    name_index: NameIndex[Employee] = field(default_factory=NameIndex)
+    scheduling_policy: SchedulingPolicy = field(default_factory=NeediestFirst)
+    # The company's own random streams; see `streams.py`.
+    rng: random.Random = field(default_factory=random.Random)
+    np_rng: np.random.Generator = field(default_factory=np.random.default_rng)
+    # Set to time the day loop; see `metrics.py`.
+    metrics: Optional[Metrics] = None
+
+    day: int = 0  # Days since the company opened.
     day_of_week: int = 0
     min_shift_size: int = 5
     max_shift_size: int = 10
     hourly_wage: float = 1.35 / 8  # $1.35 per day (1860s dollars) (~17 cents/hr)
-    daily_punchcard: defaultdict[Employee, int] = field(
-        default_factory=lambda: defaultdict(int)
-    )
     weekly_operating_expenses: float = 21.00
     hourly_revenue: float = 0.25
+    understaffed: bool = False
 
-    @staticmethod
-    def generate() -> "Company":
-        c = Company(
-            employees=set(),
-            scheduled_today=set(),
-            cant_be_scheduled_for_days=defaultdict(int),
-            desired_workdays_per_week={},
-        )
+    nicknames: NicknamePool = field(init=False)  # Draws from `rng`.
+    leave: LeaveCalendar = field(init=False)
+    population: Population = field(init=False)
+    rumors: Rumors = field(init=False)
+
+    def __post_init__(self):
+        self.nicknames = NicknamePool(rng=self.rng)
+        self.leave = LeaveCalendar(self.roster)
+        self.population = Population(self)
+        self.rumors = Rumors(self.roster, self.event_log)
 
-        n_emps = random.randint(5, 15)
-        for _ in range(n_emps):
-            c.hire(Employee.generate())
+    @property
+    def cant_be_scheduled_for_days(self) -> LeaveView:
+        return LeaveView(self.leave, self.day)
 
-        c.cant_be_scheduled_for_days = defaultdict(
-            int, {employee: random.randint(0, 2) for employee in c.employees}
-        )
+    @property
+    def desired_workdays_per_week(self) -> ColumnView:
+        return ColumnView(self.roster, "desired_workdays_per_week")
+
+    @property
+    def weekly_hours_worked(self) -> ColumnView:
+        return ColumnView(self.roster, "weekly_hours_worked")
+
+    @property
+    def daily_punchcard(self) -> ColumnView:
+        return ColumnView(self.roster, "daily_punchcard")
+
+    @staticmethod
+    def generate(seed: Seed = None) -> "Company":
+        rng, np_rng = company_rngs(seed)
+        c = Company(rng=rng, np_rng=np_rng)
+
+        n_emps = c.rng.randint(5, 15)
+        for e in Employee.generate_many(n_emps, c.np_rng):
+            c.hire(e)
+            c.cant_be_scheduled_for_days[e] = c.rng.randint(0, 2)
 
-        c.scheduled_today = set(
-            employee
-            for employee, days_till_scheduled in c.cant_be_scheduled_for_days.items()
-            if days_till_scheduled == 0
+        c.scheduled_today = IndexedSet(
+            c.roster.members[np.flatnonzero(c.roster.column("available"))]
         )
 
         return c
@@ -399,130 +560,201 @@ class Company:
         start_delay: Optional[int] = None,
         desired_workdays: Optional[int] = None,
     ):
-        same_name = [o for o in self.employees if o.first_name == e.first_name]
-        if same_name:
-            Person.give_distinguishing_nicknames(
-                [e, *same_name], set(o.nickname for o in self.employees)
-            )
+        if e.nickname is not None:
+            self.nicknames.claim(e.nickname)
 
-        self.desired_workdays_per_week[e] = desired_workdays or random.randint(3, 6)
-        self.cant_be_scheduled_for_days[e] = start_delay or random.randint(0, 5)
+        same_name = self.employees_by_first_name[e.first_name]
+        if same_name:
+            # Everyone sharing a first name with somebody else already has a
+            # nickname, so only a lone namesake might still need one.
+            namesakes = list(same_name) if len(same_name) == 1 else []
+            Person.give_distinguishing_nicknames([e, *namesakes], self.nicknames)
+            for o in namesakes:
+                self.name_index.update(o)
+        same_name.add(e)
+        self.name_index.add(e)
+
+        self.roster.add(e)
+        self.desired_workdays_per_week[e] = desired_workdays or self.rng.randint(3, 6)
+        self.cant_be_scheduled_for_days[e] = start_delay or self.rng.randint(0, 5)
         self.employees.add(e)
 
+    def remove(self, e: Employee):
+        # The employee keeps their roster row until their last hours are paid
+        # out in `end_of_week`.
+        self.employees.remove(e)
+        self.roster.retire(e)
+        self.name_index.remove(e)
+
+        same_name = self.employees_by_first_name[e.first_name]
+        same_name.remove(e)
+        if not same_name:
+            del self.employees_by_first_name[e.first_name]
+
+        if e.nickname is not None:
+            self.nicknames.release(e.nickname)
+
+    def change_feelings_toward(
+        self, e: Employee, delta: float, where: Optional[np.ndarray] = None
+    ):
+        # Adds `delta` to how everyone in the boolean roster mask `where`
+        # (by default, every other employee) feels about `e`, all at once.
+        rows = np.flatnonzero(self.roster.column("active") if where is None else where)
+        rows = rows[rows != e._row]
+        self.roster.relationships.add_many(rows, e._row, delta)
+
+    def change_dispositions(self, delta: float, where: np.ndarray):
+        # Adds `delta` to the disposition of everyone in the roster mask `where`.
+        column = self.roster.column("disposition_toward_company")
+        column[where] += delta
+        self.roster.changed("disposition_toward_company")
+
+    def run_events(
+        self,
+        event_kinds: list[type["Event"]],
+        happened: Optional[Callable[["Event"], None]] = None,
+    ) -> list["Event"]:
+        # Generates, applies and logs one event of each kind that can happen,
+        # calling `happened` after each. The day's changes in who feels what
+        # about whom all land together once its events are over.
+        events = []
+        with self.roster.relationships.deferred():
+            for event_kind in event_kinds:
+                e = event_kind.generate(self)
+                if e is None:
+                    continue
+                e.apply(self)
+                self.event_log.record(e)
+                events.append(e)
+                if happened is not None:
+                    happened(e)
+        return events
+
+    @measured("start_of_day", touched=_on_shift)
     def start_of_day(self):
-        self.event_history.append([])
+        self.event_log.start_day(self.day)
         self.create_todays_schedule()
-        self.daily_punchcard = defaultdict(int)
+        self.roster.column("daily_punchcard")[:] = 0
 
+    @measured("end_of_day", touched=_on_shift)
     def end_of_day(self) -> int:
+        self.rumors.end_of_day(self.event_log.todays_events, self.day)
+
+        self.day += 1
         self.day_of_week += 1
         self.day_of_week %= 7
 
-        total_labor_hours = 0
+        punchcard = self.roster.column("daily_punchcard")
 
         # These all worked a full shift.
-        for employee in self.scheduled_today:
-            self.daily_punchcard[employee] += 8
+        punchcard[self.roster.rows_of(self.scheduled_today)] += 8
+
+        weekly_hours = self.roster.column("weekly_hours_worked")
+        weekly_hours += punchcard
+
+        self.leave.start_day(self.day)
+
+        return int(punchcard.sum())
+
+    @measured("end_of_week", touched=lambda args, report: len(report.employees))
+    def end_of_week(self) -> "WeeklyReport":
+        hours = self.roster.column("weekly_hours_worked")
+        worked = np.flatnonzero(hours)
+        unscheduled = np.flatnonzero(self.roster.column("active") & (hours == 0))
+
+        total_labor_hours = int(hours.sum())
+        report = WeeklyReport(
+            employees=self.roster.members[worked],
+            hours=hours[worked],
+            wages=self.roster.column("hourly_wage")[worked],
+            unscheduled=set(self.roster.members[unscheduled]),
+            operating_costs=self.rng.normalvariate(
+                self.weekly_operating_expenses, 2.00
+            ),
+            revenue=total_labor_hours
+            * self.rng.normalvariate(self.hourly_revenue, 0.05),
+        )
+
+        hours[:] = 0
+        self.rumors.forget(self.roster.retired_rows)
+        self.roster.recycle_retired_rows()
+        return report
 
-        for employee, hours_worked in self.daily_punchcard.items():
-            self.weekly_hours_worked[employee] += hours_worked
-            total_labor_hours += hours_worked
+    @measured("create_todays_schedule", touched=_on_shift)
+    def create_todays_schedule(self):
+        # Conditions for being put on the schedule:
+        # 1. Haven't gone over their weekly hours.
+        # 2. Aren't out for a few days.
+        eligible = np.flatnonzero(
+            self.roster.column("available")
+            & (
+                self.roster.column("weekly_hours_worked")
+                < self.roster.column("desired_workdays_per_week") * 8
+            )
+        )
+        self.understaffed = len(eligible) < self.min_shift_size
+
+        rows = self.scheduling_policy.choose(self, eligible)
+        self.scheduled_today = IndexedSet(self.roster.members[rows])
 
-        for employee, days_till_scheduled in self.cant_be_scheduled_for_days.items():
-            if days_till_scheduled > 0:
-                self.cant_be_scheduled_for_days[employee] -= 1
 
-        return total_labor_hours
+@dataclass
+class WeeklyReport:
+    employees: np.ndarray  # Everyone who worked this week, as `Employee` objects.
+    hours: np.ndarray
+    wages: np.ndarray
+    unscheduled: set[Employee]
+    operating_costs: float
+    revenue: float
+
+    @property
+    def total_labor_hours(self) -> int:
+        return int(self.hours.sum())
+
+    @property
+    def total_pay(self) -> float:
+        return float(self.hours @ self.wages)
+
+    @property
+    def expenses(self) -> float:
+        return self.operating_costs + self.total_pay
+
+    @property
+    def profit(self) -> float:
+        return self.revenue - self.expenses
 
-    def end_of_week(self):
+    def print(self):
         print("END OF WEEK")
         print("-----------")
         print(f"{"Employee":^30} |{"Hrs":^5}|{"Wage":^6}| {"Pay ($)":^6}")
         print("-" * 60)
-        total_pay = 0.00
-        total_labor_hours = 0
-        for employee, hours in self.weekly_hours_worked.items():
-            if hours > 0:
-                wage = employee.hourly_wage
-                pay = hours * wage
-                total_labor_hours += hours
-                total_pay += pay
-                print(
-                    f"{employee.full_name():<30} | {hours:>3} | {wage:>2.2f} | {pay:6.2f}"
-                )
+        for employee, hours, wage in zip(self.employees, self.hours, self.wages):
+            pay = hours * wage
+            print(
+                f"{employee.full_name():<30} | {hours:>3} | {wage:>2.2f} | {pay:6.2f}"
+            )
         print("-" * 60)
-        print(f"{'Totals':<30} |{total_labor_hours:>4} |{"--":^6}| {total_pay:6.2f}")
+        print(
+            f"{'Totals':<30} |{self.total_labor_hours:>4} |{"--":^6}| {self.total_pay:6.2f}"
+        )
 
-        unscheduled = {e for e in self.employees if self.weekly_hours_worked[e] == 0}
-        if unscheduled:
+        if self.unscheduled:
             print()
             print("Unscheduled employees this week:")
-            for employee in unscheduled:
+            for employee in self.unscheduled:
                 print(f"\t- {employee}")
 
         print()
-        operating_costs = random.normalvariate(self.weekly_operating_expenses, 2.00)
-        expenses = operating_costs + total_pay
-        revenue = total_labor_hours * random.normalvariate(self.hourly_revenue, 0.05)
-        profit = revenue - expenses
-        print(f"Expenses:      {expenses:>6.2f}")
-        print(f"    Wages:     {total_pay:>6.2f}")
-        print(f"    Operating: {operating_costs:>6.2f}")
-        print(f"Revenue:       {revenue:>6.2f}")
+        print(f"Expenses:      {self.expenses:>6.2f}")
+        print(f"    Wages:     {self.total_pay:>6.2f}")
+        print(f"    Operating: {self.operating_costs:>6.2f}")
+        print(f"Revenue:       {self.revenue:>6.2f}")
         print(f"----------------------------------")
-        print(f"Profit:        {profit:>6.2f}")
-
-        self.weekly_hours_worked = defaultdict(int)
+        print(f"Profit:        {self.profit:>6.2f}")
 
-    def create_todays_schedule(self):
-        self.scheduled_today = set()
-        while len(self.scheduled_today) < self.min_shift_size:
-            no_emp_added = True
-
-            for employee in self.employees:
-                if employee in self.scheduled_today:
-                    continue
 
-                # Conditions for being put on the schedule:
-                # 1. Haven't gone over their weekly hours.
-                # 2. Aren't out for a few days.
-
-                over_weekly_hours = (
-                    self.weekly_hours_worked[employee]
-                    >= self.desired_workdays_per_week[employee] * 8
-                )
-                out_for_a_bit = self.cant_be_scheduled_for_days[employee] > 0
-
-                if not over_weekly_hours and not out_for_a_bit:
-
-                    # Prioritize employees who need the hours the most.
-                    days_left_in_week = 7 - self.day_of_week
-
-                    if self.desired_workdays_per_week[employee] >= days_left_in_week:
-                        self.scheduled_today.add(employee)  # Definitely add them.
-                        no_emp_added = False
-                    elif random.random() < 0.5:
-                        self.scheduled_today.add(employee)
-                        no_emp_added = False
-                    else:
-                        continue
-
-            if no_emp_added:
-                print()
-                print(">>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>")
-                print("Understaffed!")
-                print(">>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>")
-                print()
-                break
-
-        if len(self.scheduled_today) > self.max_shift_size:
-            self.scheduled_today = set(
-                random.sample(list(self.scheduled_today), self.max_shift_size)
-            )
-
-
-def random_relative() -> str:
-    return random.choice(
+def random_relative(rng: random.Random) -> str:
+    return rng.choice(
         ["son", "daughter", "mother", "father", "grandson", "granddaughter"]
     )
 
@@ -537,14 +769,43 @@ class Event(ABC):
     def apply(self, company: Company):
         pass
 
+    # Returns `None` when the company can't support this kind of event today
+    # (e.g. nobody is on the schedule).
     @staticmethod
     @abstractmethod
-    def generate(company: Company) -> "Event":
+    def generate(company: Company) -> Optional["Event"]:
         pass
 
-    @abstractmethod
-    def described_by_to(self, speaker: Employee, listener: Employee) -> str:
-        pass
+    # What employees say about the event; see `dialogue.py`.
+    DIALOGUE: ClassVar[Dialogue]
+
+    def described_by_to(
+        self, speaker: Employee, listener: Employee, rng: random.Random
+    ) -> str:
+        return self.DIALOGUE.render(self, speaker, listener, rng)
+
+    def employees_touched(self, company: Company) -> int:
+        # For metrics: how many employees applying the event changes.
+        return len(self.DIALOGUE.participants)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every kind of event is timed under its own name, including ones that
+        # inherit `generate` or `apply`.
+        name = cls.__name__
+        cls.generate = staticmethod(
+            measured(
+                f"{name}.generate",
+                touched=lambda args, e: (
+                    0 if e is None else len(e.DIALOGUE.participants)
+                ),
+            )(inspect.unwrap(cls.generate))
+        )
+        cls.apply = measured(
+            f"{name}.apply",
+            company_arg=1,
+            touched=lambda args, result: args[0].employees_touched(args[1]),
+        )(inspect.unwrap(cls.apply))
 
 
 @dataclass
@@ -558,35 +819,39 @@ class CallOut(Event):
         company.scheduled_today.remove(self.employee)
 
     @staticmethod
-    def generate(company: Company) -> Event:
-        if random.random() < 1 / (1 + len(CallOut.__subclasses__())):
-            return CallOut(employee=random.choice(list(company.scheduled_today)))
-        else:
-            event = random.choice(CallOut.__subclasses__())
-            return event.generate(company)
-
-    def described_by_to(self, speaker, listener):
-        if speaker == self.employee:
-            if speaker.likes(listener):
-                return f"'Sorry {listener}, I can't talk about it.'"
-            elif speaker.hates(listener):
-                return f"'None of your concern, {listener}.'"
-            else:
-                return "'I'd prefer not to talk about it.'"
-        elif listener == self.employee:
-            if speaker.likes(listener):
-                return "'You called out, but I'm sure you had your reasons.'"
-            elif listener.dislikes(speaker):
-                return "'You really owe us an apology for leaving us short-handed.'"
-            else:
-                return "'I stay out of your business, you stay out of mine.'"
-        else:
-            if speaker.likes(self.employee):
-                return f"'Yeah {self.employee} called out. I hope everything's okay.'"
-            elif speaker.dislikes(self.employee):
-                return f"'{self.employee} called out. Again.'"
-            else:
-                return f"'{self.employee} called out. Who knows why though, right?'"
+    def generate(company: Company) -> Optional[Event]:
+        if not company.scheduled_today:
+            return None
+        return CallOut(employee=company.scheduled_today.choice(company.rng))
+
+    DIALOGUE = Dialogue(
+        ["employee"],
+        Line(
+            "self",
+            "speaker likes listener",
+            "'Sorry {listener}, I can't talk about it.'",
+        ),
+        Line("self", "speaker hates listener", "'None of your concern, {listener}.'"),
+        Line("self", "", "'I'd prefer not to talk about it.'"),
+        Line(
+            "to",
+            "speaker likes listener",
+            "'You called out, but I'm sure you had your reasons.'",
+        ),
+        Line(
+            "to",
+            "listener dislikes speaker",
+            "'You really owe us an apology for leaving us short-handed.'",
+        ),
+        Line("to", "", "'I stay out of your business, you stay out of mine.'"),
+        Line(
+            "about",
+            "speaker likes employee",
+            "'Yeah {employee} called out. I hope everything's okay.'",
+        ),
+        Line("about", "speaker dislikes employee", "'{employee} called out. Again.'"),
+        Line("about", "", "'{employee} called out. Who knows why though, right?'"),
+    )
 
 
 @dataclass
@@ -607,36 +872,50 @@ class CallOutSick(CallOut):
         company.cant_be_scheduled_for_days[self.employee] = self.out_for_days
 
     @staticmethod
-    def generate(company: Company) -> Event:
-        employee = random.choice(list(company.scheduled_today))
-        return CallOutSick(employee=employee, out_for_days=random.randint(0, 3))
-
-    def described_by_to(self, speaker, listener):
-        if speaker == self.employee:
-            if speaker.likes(listener):
-                return "'I was not feeling well at all. I apologize if I put more work on y'all.'"
-            elif speaker.hates(listener):
-                return "'Now that I can't work you're interested in my health, is that it {listener}?'"
-            else:
-                return "'I had to rest up or I'd be no good to anyone.'"
-        elif listener == self.employee:
-            if speaker.likes(listener):
-                return "'Glad to see you back on your feet. We missed you {listener}.'"
-            elif listener.dislikes(speaker):
-                return "'Looks like you really were sick! Good thing you're back, we've been busy.'"
-            else:
-                return (
-                    "'Hey, as long as you're feeling better, that's all that matters.'"
-                )
-        else:
-            if speaker.likes(self.employee):
-                return f"'{self.employee} called out sick. I hope {self.theyre} feeling better.'"
-            elif speaker.dislikes(self.employee):
-                return f"'{self.employee} called out sick. Again.'"
-            else:
-                return (
-                    f"'{self.employee} called out sick. Who knows why though, right?'"
-                )
+    def generate(company: Company) -> Optional[Event]:
+        if not company.scheduled_today:
+            return None
+        employee = company.scheduled_today.choice(company.rng)
+        return CallOutSick(employee=employee, out_for_days=company.rng.randint(0, 3))
+
+    DIALOGUE = Dialogue(
+        ["employee"],
+        Line(
+            "self",
+            "speaker likes listener",
+            "'I was not feeling well at all. I apologize if I put more work on y'all.'",
+        ),
+        Line(
+            "self",
+            "speaker hates listener",
+            "'Now that I can't work you're interested in my health, is that it {listener}?'",
+        ),
+        Line("self", "", "'I had to rest up or I'd be no good to anyone.'"),
+        Line(
+            "to",
+            "speaker likes listener",
+            "'Glad to see you back on your feet. We missed you, {listener}.'",
+        ),
+        Line(
+            "to",
+            "listener dislikes speaker",
+            "'Looks like you really were sick! Good thing you're back, we've been busy.'",
+        ),
+        Line(
+            "to",
+            "",
+            "'Hey, as long as you're feeling better, that's all that matters.'",
+        ),
+        Line(
+            "about",
+            "speaker likes employee",
+            "'{employee} called out sick. I hope {employee.theyre} feeling better.'",
+        ),
+        Line(
+            "about", "speaker dislikes employee", "'{employee} called out sick. Again.'"
+        ),
+        Line("about", "", "'{employee} called out sick. Who knows why though, right?'"),
+    )
 
 
 @dataclass
@@ -645,9 +924,11 @@ class CallOutRelativeSick(CallOut):
 
     @staticmethod
     def generate(company):
+        if not company.scheduled_today:
+            return None
         return CallOutRelativeSick(
-            employee=random.choice(list(company.scheduled_today)),
-            relative=random_relative(),
+            employee=company.scheduled_today.choice(company.rng),
+            relative=random_relative(company.rng),
         )
 
     def print(self):
@@ -657,24 +938,28 @@ class CallOutRelativeSick(CallOut):
     def apply(self, company):
         company.scheduled_today.remove(self.employee)
 
-    def described_by_to(self, speaker: Employee, listener: Employee):
-        if speaker == self.employee:
-            if speaker.hates(listener):
-                return f"'You wouldn't understand, {listener}. My {self.relative} is sick.'"
-            else:
-                return f"'My {self.relative} has gotten worse. Sorry for the inconvenience, but I had to be there.'"
-        elif listener == self.employee:
-            if listener.hates(speaker):
-                return f"'Your {self.relative} sure gets sick a lot.'"
-            else:
-                return f"'I hope your {self.relative} is feeling better.'"
-        else:
-            if speaker.likes(self.employee):
-                return f"'{self.employee} called out. {self.They} said {self.their} {self.relative} is sick.'"
-            elif speaker.dislikes(self.employee):
-                return f"'{self.employee} called out. Again.'"
-            else:
-                return f"'{self.employee} called out. Who knows why though, right?'"
+    DIALOGUE = Dialogue(
+        ["employee"],
+        Line(
+            "self",
+            "speaker hates listener",
+            "'You wouldn't understand, {listener}. My {relative} is sick.'",
+        ),
+        Line(
+            "self",
+            "",
+            "'My {relative} has gotten worse. Sorry for the inconvenience, but I had to be there.'",
+        ),
+        Line("to", "listener hates speaker", "'Your {relative} sure gets sick a lot.'"),
+        Line("to", "", "'I hope your {relative} is feeling better.'"),
+        Line(
+            "about",
+            "speaker likes employee",
+            "'{employee} called out. {employee.They} said {employee.their} {relative} is sick.'",
+        ),
+        Line("about", "speaker dislikes employee", "'{employee} called out. Again.'"),
+        Line("about", "", "'{employee} called out. Who knows why though, right?'"),
+    )
 
 
 @dataclass
@@ -688,18 +973,16 @@ class Quitting(Event):
     def apply(self, company: Company):
         raise NotImplementedError()
 
-    @staticmethod
-    def generate(company: Company) -> Event:
-        return random.choice(Quitting.__subclasses__()).generate(company)
-
 
 @dataclass
 class QuittingForBetterJob(Quitting):
 
     @staticmethod
     def generate(company):
+        if not company.employees:
+            return None
         return QuittingForBetterJob(
-            employee=random.choice(list(company.employees)), worked_whole_day=True
+            employee=company.employees.choice(company.rng), worked_whole_day=True
         )
 
     def print(self):
@@ -707,90 +990,116 @@ class QuittingForBetterJob(Quitting):
         print(f"Today was {e}'s last day. {e.They} said {e.they}'d found a better job.")
 
     def apply(self, company):
-        company.employees.remove(self.employee)
-
-    def described_by_to(self, speaker: Employee, listener: Employee):
-        e = self.employee
-        if speaker == self.employee:
-            return "'I found a better job. Sorry, but I have to go.'"
-        elif listener == self.employee:
-            if speaker.likes(listener):
-                return f"'I'm happy for you, {listener}. Good luck!'"
-            elif speaker.dislikes(listener):
-                return "'So glad to hear you're moving on to greener pastures!'"
-            else:
-                if speaker.disposition_toward_company > 0.0:
-                    return "'I hope you find what you're looking for.'"
-                else:
-                    return "'Best of luck with the new job! Can't be any worse than this place...'"
-        else:
-            if speaker.likes(self.employee):
-                return f"'Did you hear? {e}'s got a new job! What are we gonna do without {e.them}!'"
-            elif speaker.dislikes(self.employee):
-                return f"'{e}'s up and quit. Can't say I'm sorry to see {e.them} go...'"
-            else:
-                return f"'{e}'s gone. New job I think.'"
+        company.remove(self.employee)
+
+    DIALOGUE = Dialogue(
+        ["employee"],
+        Line("self", "", "'I found a better job. Sorry, but I have to go.'"),
+        Line(
+            "to",
+            "speaker likes listener",
+            "'I'm happy for you, {listener}. Good luck!'",
+        ),
+        Line(
+            "to",
+            "speaker dislikes listener",
+            "'So glad to hear you're moving on to greener pastures!'",
+        ),
+        Line("to", "speaker content", "'I hope you find what you're looking for.'"),
+        Line(
+            "to",
+            "",
+            "'Best of luck with the new job! Can't be any worse than this place...'",
+        ),
+        Line(
+            "about",
+            "speaker likes employee",
+            "'Did you hear? {employee}'s got a new job! What are we gonna do without {employee.them}!'",
+        ),
+        Line(
+            "about",
+            "speaker dislikes employee",
+            "'{employee}'s up and quit. Can't say I'm sorry to see {employee.them} go...'",
+        ),
+        Line("about", "", "'{employee}'s gone. New job I think.'"),
+    )
 
 
 @dataclass
 class QuittingDislikesCoworkers(Quitting):
     @staticmethod
     def generate(company):
-        for emp1 in company.employees:
-            for emp2 in company.employees:
-                if emp1 == emp2:
-                    continue
-                if (
-                    emp1.hates(emp2)
-                    and emp2.dislikes(emp1)
-                    and emp1.disposition_toward_company < 0
-                ):
-                    return QuittingDislikesCoworkers(
-                        employee=emp1, worked_whole_day=False
-                    )
-        else:
+        # Unhappy employees who hate a coworker who dislikes them back.
+        haters, _ = company.population.feuds(disposition=(None, 0.0))
+        if len(haters) == 0:
             # Nobody hates each other enough to quit.
             return QuittingForBetterJob.generate(company)
 
+        emp1 = company.roster.members[company.rng.choice(haters)]
+        # Only someone on today's shift can walk out part-way through it.
+        return QuittingDislikesCoworkers(
+            employee=emp1,
+            worked_whole_day=emp1 not in company.scheduled_today,
+        )
+
     def print(self):
         e = self.employee
         mid_shift = (
-            f"part-way through {e.their} shift" if not self.worked_whole_day else ""
+            f" part-way through {e.their} shift" if not self.worked_whole_day else ""
         )
         print(
-            f"{e} quit{mid_shift}. {e.They} said they can't stand some of {e.their} coworkers."
+            f"{e} quit{mid_shift}. {e.They} said {e.they} can't stand some of {e.their} coworkers."
         )
 
     def apply(self, company):
-        company.employees.remove(self.employee)
+        company.remove(self.employee)
         if not self.worked_whole_day:
             company.scheduled_today.remove(self.employee)
-            company.daily_punchcard[self.employee] += random.randint(2, 6)
-
-    def described_by_to(self, speaker: Employee, listener: Employee):
-        e = self.employee
-        if speaker == e:
-            return "'These people will stab you in the back as soon as you turn around. I'm out.'"
-        elif listener == e:
-            if speaker.likes(listener):
-                return (
-                    "'They've treated you like shit, you didn't deserve any of this.'"
-                )
-            elif speaker.hates(listener) and listener.hates(speaker):
-                return "'Don't let the door hit you on your way out!'"
-            elif listener.hates(speaker):
-                return "'I suppose you think I'm the one driving you to leave?'"
-            else:
-                return (
-                    "'I'm not taking sides. Hope your next job is more to your liking.'"
-                )
-        else:
-            if speaker.dislikes(e):
-                return f"'{e} thinks everyone's out to get {e.them}. Not sorry to see {e.them} go.'"
-            elif speaker.likes(e):
-                return f"'People here have treated {e} like shit. {e.They} didn't deserve any of this!'"
-            else:
-                return f"'{e} quit. {e.They} said there's too much drama here.'"
+            company.daily_punchcard[self.employee] += company.rng.randint(2, 6)
+
+    DIALOGUE = Dialogue(
+        ["employee"],
+        Line(
+            "self",
+            "",
+            "'These people will stab you in the back as soon as you turn around. I'm out.'",
+        ),
+        Line(
+            "to",
+            "speaker likes listener",
+            "'They've treated you like shit, you didn't deserve any of this.'",
+        ),
+        Line(
+            "to",
+            "speaker hates listener and listener hates speaker",
+            "'Don't let the door hit you on your way out!'",
+        ),
+        Line(
+            "to",
+            "listener hates speaker",
+            "'I suppose you think I'm the one driving you to leave?'",
+        ),
+        Line(
+            "to",
+            "",
+            "'I'm not taking sides. Hope your next job is more to your liking.'",
+        ),
+        Line(
+            "about",
+            "speaker dislikes employee",
+            "'{employee} thinks everyone's out to get {employee.them}. Not sorry to see {employee.them} go.'",
+        ),
+        Line(
+            "about",
+            "speaker likes employee",
+            "'People here have treated {employee} like shit. {employee.They} didn't deserve any of this!'",
+        ),
+        Line(
+            "about",
+            "",
+            "'{employee} quit. {employee.They} said there's too much drama here.'",
+        ),
+    )
 
 
 @dataclass
@@ -799,13 +1108,15 @@ class QuittingForRelative(Quitting):
 
     @staticmethod
     def generate(company: Company):
-        e = random.choice(list(company.employees))
+        if not company.employees:
+            return None
+        e = company.employees.choice(company.rng)
         return QuittingForRelative(
-            employee=e, worked_whole_day=True, relative=random_relative()
+            employee=e, worked_whole_day=True, relative=random_relative(company.rng)
         )
 
     def apply(self, company):
-        company.employees.remove(self.employee)
+        company.remove(self.employee)
 
     def print(self):
         e = self.employee
@@ -813,30 +1124,42 @@ class QuittingForRelative(Quitting):
             f"{e} quit. {e.They} said {e.their} {self.relative} requires more care now."
         )
 
-    def described_by_to(self, speaker: Employee, listener: Employee):
-        e = self.employee
-        if speaker == e:
-            return f"'My {self.relative} needs me more and more these days. I had to leave.'"
-        elif listener == e:
-            if speaker.likes(listener):
-                return f"'I understand, {listener}. Family comes first.'"
-            elif speaker.dislikes(listener):
-                return f"'Your {self.relative} sure needs a lot of care, huh?'"
-            else:
-                return f"'I hope everything works out with your {self.relative}.'"
-        else:
-            if speaker.likes(e):
-                return f"'{e} quit. {e.They} said {e.their} {self.relative} needs more care.'"
-            elif speaker.dislikes(e):
-                return f"'{e} quit. Always some excuse with {e.them}.'"
-            else:
-                return random.choice(
-                    [
-                        f"'{e} quit. Something about {e.their} {self.relative}.'",
-                        f"'Anyone know what's going on with {e}? Did {e.they} quit?'",
-                        f"'{e} quitting? Unfortunately I can't say I'm surprised. {e.Their} {self.relative} needs {e.them}.'",
-                    ]
-                )
+    DIALOGUE = Dialogue(
+        ["employee"],
+        Line(
+            "self",
+            "",
+            "'My {relative} needs me more and more these days. I had to leave.'",
+        ),
+        Line(
+            "to",
+            "speaker likes listener",
+            "'I understand, {listener}. Family comes first.'",
+        ),
+        Line(
+            "to",
+            "speaker dislikes listener",
+            "'Your {relative} sure needs a lot of care, huh?'",
+        ),
+        Line("to", "", "'I hope everything works out with your {relative}.'"),
+        Line(
+            "about",
+            "speaker likes employee",
+            "'{employee} quit. {employee.They} said {employee.their} {relative} needs more care.'",
+        ),
+        Line(
+            "about",
+            "speaker dislikes employee",
+            "'{employee} quit. Always some excuse with {employee.them}.'",
+        ),
+        Line(
+            "about",
+            "",
+            "'{employee} quit. Something about {employee.their} {relative}.'",
+            "'Anyone know what's going on with {employee}? Did {employee.they} quit?'",
+            "'{employee} quitting? Unfortunately I can't say I'm surprised. {employee.Their} {relative} needs {employee.them}.'",
+        ),
+    )
 
 
 @dataclass
@@ -848,61 +1171,68 @@ class Argument(Event):
         print(f"{self.emp1} and {self.emp2} got into a big argument.")
 
     def apply(self, company: Company):
+        relationships = company.roster.relationships
+        one, two = self.emp1._row, self.emp2._row
         if self.emp1.likes(self.emp2) and self.emp2.likes(self.emp1):
-            self.emp1.relationships[self.emp2] += 0.05
+            relationships.add(one, two, 0.05)
         else:
             self.emp1.disposition_toward_company -= 0.1
             self.emp2.disposition_toward_company -= 0.1
-            self.emp1.relationships[self.emp2] -= 0.1
-            self.emp2.relationships[self.emp1] -= 0.1
+            relationships.add_many([one, two], [two, one], -0.1)
 
     @staticmethod
-    def generate(company: Company) -> Event:
-        emp1 = random.choice(list(company.scheduled_today))
-        emp2 = random.choice(list(company.scheduled_today - {emp1}))
+    def generate(company: Company) -> Optional[Event]:
+        if len(company.scheduled_today) < 2:
+            return None
+        emp1 = company.scheduled_today.choice(company.rng)
+        emp2 = company.scheduled_today.choice_excluding(emp1, company.rng)
         return Argument(emp1=emp1, emp2=emp2)
 
-    def described_by_to(self, speaker: Employee, listener: Employee):
-        if speaker in {self.emp1, self.emp2} and listener in {self.emp1, self.emp2}:
-            if speaker.likes(listener):
-                return "'We had a disagreement, but it's all sorted out now.'"
-            elif speaker.hates(listener):
-                return "'You just had to have the last word, didn't you.'"
-            else:
-                [other] = list({self.emp1, self.emp2} - {speaker})
-                return random.choice(
-                    [
-                        f"'I'm done with {other}. {other.Theyre} impossible.'",
-                        f"'{other} just rubs me the wrong way. {other.they} better watch {other.their} mouth.'",
-                        f"'I can't stand {other}! {other.Theyre} probably talking about me right now.'",
-                    ]
-                )
-        elif listener in {self.emp1, self.emp2}:
-            [other] = list({self.emp1, self.emp2} - {listener})
-            if listener.likes(speaker):
-                return f"'I'm glad you and {other} worked things out in the end.'"
-            else:
-                return "'I'm not getting involved in this. You two sort it out.'"
-
-        elif speaker in {self.emp1, self.emp2}:
-            [other] = list({self.emp1, self.emp2} - {speaker})
-            if speaker.likes(other):
-                return (
-                    f"'{other} and I had a disagreement, but it's all sorted out now.'"
-                )
-            elif speaker.hates(other):
-                return f"'{other} just had to have the last word, didn't {other.they}.'"
-            else:
-                return f"'I'm done with {other}. {other.Theyre} impossible!'"
-        else:
-            return random.choice(
-                [
-                    f"'I'm exhausted. {self.emp2} and {self.emp1} were at each other's throats today.'",
-                    f"'You wouldn't believe the argument {self.emp2} and {self.emp1} had today. Is this grade school?'",
-                    f"'{self.emp2} and {self.emp1} had a big argument today. I'm staying out of it.'",
-                    f"'Arguments happen. I'm sure {self.emp1} and {self.emp2} will work it out.'",
-                ]
-            )
+    DIALOGUE = Dialogue(
+        ["emp1", "emp2"],
+        Line(
+            "both",
+            "speaker likes listener",
+            "'We had a disagreement, but it's all sorted out now.'",
+        ),
+        Line(
+            "both",
+            "speaker hates listener",
+            "'You just had to have the last word, didn't you.'",
+        ),
+        Line(
+            "both",
+            "",
+            "'I'm done with {other}. {other.Theyre} impossible.'",
+            "'{other} just rubs me the wrong way. {other.They} better watch {other.their} mouth.'",
+            "'I can't stand {other}! {other.Theyre} probably talking about me right now.'",
+        ),
+        Line(
+            "to",
+            "listener likes speaker",
+            "'I'm glad you and {other} worked things out in the end.'",
+        ),
+        Line("to", "", "'I'm not getting involved in this. You two sort it out.'"),
+        Line(
+            "self",
+            "speaker likes other",
+            "'{other} and I had a disagreement, but it's all sorted out now.'",
+        ),
+        Line(
+            "self",
+            "speaker hates other",
+            "'{other} just had to have the last word, didn't {other.they}.'",
+        ),
+        Line("self", "", "'I'm done with {other}. {other.Theyre} impossible!'"),
+        Line(
+            "about",
+            "",
+            "'I'm exhausted. {emp2} and {emp1} were at each other's throats today.'",
+            "'You wouldn't believe the argument {emp2} and {emp1} had today. Is this grade school?'",
+            "'{emp2} and {emp1} had a big argument today. I'm staying out of it.'",
+            "'Arguments happen. I'm sure {emp1} and {emp2} will work it out.'",
+        ),
+    )
 
 
 @dataclass
@@ -918,14 +1248,16 @@ class Gossip(Event):
 
     def apply(self, company: Company):
         self.gossip.disposition_toward_company -= 0.1
-        self.gossip.relationships[self.subject] -= 0.1
+        company.roster.relationships.add(self.gossip._row, self.subject._row, -0.1)
         self.subject.disposition_toward_company -= 0.1
 
     @staticmethod
-    def generate(company: Company) -> Event:
-        gossip = random.choice(list(company.scheduled_today))
-        subject = random.choice(list(company.employees - {gossip}))
-        dirt = random.choice(
+    def generate(company: Company) -> Optional[Event]:
+        if not company.scheduled_today or len(company.employees) < 2:
+            return None
+        gossip = company.scheduled_today.choice(company.rng)
+        subject = company.employees.choice_excluding(gossip, company.rng)
+        dirt = company.rng.choice(
             [
                 f"said {subject.first_name} is lazy",
                 f"thought {subject.first_name} is a kiss-up",
@@ -936,28 +1268,36 @@ class Gossip(Event):
         )
         return Gossip(gossip=gossip, subject=subject, dirt=dirt)
 
-    def described_by_to(self, speaker: Employee, listener: Employee):
-        if speaker == self.gossip:
-            if speaker.likes(listener):
-                return f"'Did you {self.subject}. {self.subject.They} {self.dirt}'"
-        else:
-            if speaker.likes(self.gossip):
-                return f"'Did you hear? {self.gossip} was talking about {self.subject}. {self.gossip.They} {self.dirt}'"
-            elif speaker.dislikes(self.gossip):
-                return f"'{self.gossip} was gossiping about {self.subject}. {self.gossip.They} {self.dirt}'"
-            else:
-                return f"'{self.gossip} was gossiping about {self.subject}. {self.gossip.They} {self.dirt}'"
+    DIALOGUE = Dialogue(
+        ["gossip"],
+        Line(
+            "self",
+            "speaker likes listener",
+            "'Between you and me, {listener}, I've about had it with {subject}.'",
+        ),
+        Line(
+            "self",
+            "",
+            "'I don't know what you heard, but I never said a word about {subject}.'",
+        ),
+        Line(
+            "to about",
+            "speaker likes gossip",
+            "'Did you hear? {gossip} was talking about {subject}. {gossip.They} {dirt}.'",
+        ),
+        Line(
+            "to about",
+            "",
+            "'{gossip} was gossiping about {subject}. {gossip.They} {dirt}.'",
+        ),
+    )
 
 
 @dataclass
 class Injury(Event):
     employee: Employee
     severe: bool
-    days_off: int = 0
-
-    def __post_init__(self):
-        if self.severe:
-            self.days_off = random.randint(7, 14)
+    days_off: int
 
     def print(self):
         if self.severe:
@@ -972,87 +1312,110 @@ class Injury(Event):
     def apply(self, company: Company):
         if self.severe:
             company.scheduled_today.remove(self.employee)
-            company.daily_punchcard[self.employee] += random.randint(2, 6)
+            company.daily_punchcard[self.employee] += company.rng.randint(2, 6)
             company.cant_be_scheduled_for_days[self.employee] = self.days_off
             if self.employee.disposition_toward_company > 0.85:
                 self.employee.disposition_toward_company -= 0.15
             elif self.employee.disposition_toward_company > 0.1:
                 self.employee.disposition_toward_company *= 0.5
             elif -0.1 < self.employee.disposition_toward_company < 0.1:
-                self.employee.disposition_toward_company -= random.uniform(0.1, 0.5)
+                self.employee.disposition_toward_company -= company.rng.uniform(
+                    0.1, 0.5
+                )
             else:
                 self.employee.disposition_toward_company = -1.0
         else:
             company.scheduled_today.remove(self.employee)
-            company.daily_punchcard[self.employee] += random.randint(2, 6)
+            company.daily_punchcard[self.employee] += company.rng.randint(2, 6)
             if self.employee.disposition_toward_company > 0.85:
                 self.employee.disposition_toward_company -= 0.05
             elif self.employee.disposition_toward_company > 0.1:
                 self.employee.disposition_toward_company *= 0.9
             elif -0.5 < self.employee.disposition_toward_company < 0.1:
-                self.employee.disposition_toward_company -= random.uniform(0.05, 0.1)
+                self.employee.disposition_toward_company -= company.rng.uniform(
+                    0.05, 0.1
+                )
             else:
                 self.employee.disposition_toward_company = -1.0
 
-        for e in company.employees:
-            if e == self.employee:
-                continue
-            if e.hates(self.employee):
-                e.disposition_toward_company += 0.1
-            else:
-                e.relationships[self.employee] += 0.1
+        # Everyone else likes the injured employee a bit more, except those
+        # who hate them, who are just pleased.
+        roster = company.roster
+        haters = np.zeros(roster.size, dtype=np.bool_)
+        haters[company.population.rows(hates=[self.employee])] = True
+        company.change_dispositions(0.1, haters)
+        company.change_feelings_toward(
+            self.employee, 0.1, roster.column("active") & ~haters
+        )
+
+    def employees_touched(self, company: Company) -> int:
+        # Everyone's feelings about the injured employee change.
+        return len(company.employees)
 
     @staticmethod
-    def generate(company: Company) -> Event:
-        employee = random.choice(list(company.scheduled_today))
-        severe = random.random() < 0.3
-        return Injury(employee=employee, severe=severe)
+    def generate(company: Company) -> Optional[Event]:
+        if not company.scheduled_today:
+            return None
+        employee = company.scheduled_today.choice(company.rng)
+        severe = company.rng.random() < 0.3
+        days_off = company.rng.randint(7, 14) if severe else 0
+        return Injury(employee=employee, severe=severe, days_off=days_off)
+
+    DIALOGUE = Dialogue(
+        ["employee"],
+        Line(
+            "self",
+            "severe and employee content",
+            "'I'm in a lot of pain. I won't be back for a while.'",
+        ),
+        Line(
+            "self",
+            "severe",
+            "'This damn company will ruin me!'",
+            "'This is the last straw. I'm putting in notice tomorrow.'",
+        ),
+        Line("self", "employee content", "'I'm fine. I'll be back tomorrow.'"),
+        Line(
+            "self",
+            "",
+            "'Look, it's not serious, but this place is a safety hazard.'",
+            "'I'm fine. I'll be back in this hell-hole tomorrow.'",
+        ),
+        Line("to", "severe", "'I hope you feel better soon. Take care of yourself.'"),
+        Line("to", "", "'You're always getting hurt. Take care of yourself.'"),
+        Line(
+            "about",
+            "severe",
+            "'{employee} got hurt bad. We're gonna be short-handed for a bit.'",
+            "'If they'd serviced the equipment regularly as instructed, {employee} might not have gotten hurt. It's a damn shame.'",
+            "'{employee} got hurt bad. I hope {employee.theyre} okay.'",
+        ),
+        Line(
+            "about",
+            "",
+            "'{employee} got hurt. Again.'",
+            "'{employee} got hurt. I hope {employee.theyre} okay.'",
+            "'Maybe this'll teach {employee} to be more careful.'",
+        ),
+    )
 
-    def described_by_to(self, speaker: Employee, listener: Employee):
-        e = self.employee
-        if speaker == self.employee:
-            if self.severe:
-                if self.employee.disposition_toward_company > 0.0:
-                    return f"'I'm in a lot of pain. I won't be back for a while.'"
-                else:
-                    return random.choice(
-                        [
-                            f"'This damn company will ruin me!",
-                            f"'This is the last straw. I'm putting in notice tomorrow.'",
-                        ]
-                    )
-            else:
-                if self.employee.disposition_toward_company > 0.0:
-                    return f"'I'm fine. I'll be back tomorrow.'"
-                else:
-                    return random.choice(
-                        [
-                            f"'Look, it's not serious, but this place is a safety hazard.'",
-                            f"'I'm fine. I'll be back in this hell-hole tomorrow.'",
-                        ]
-                    )
-        elif listener == self.employee:
-            if self.severe:
-                return f"'I hope you feel better soon. Take care of yourself.'"
-            else:
-                return f"'You're always getting hurt. Take care of yourself.'"
-        else:
-            if self.severe:
-                return random.choice(
-                    [
-                        f"'{e} got hurt bad. We're gonna be short-handed for a bit.'",
-                        f"'If they'd serviced the equipment regularly as instructed, {e} might not have gotten hurt. It's a damn shame.'",
-                        f"'{e} got hurt bad. I hope {e.theyre} okay.'",
-                    ]
-                )
-            else:
-                return random.choice(
-                    [
-                        f"'{e} got hurt. Again.'",
-                        f"'{e} got hurt. I hope {e.theyre} okay.'",
-                        f"'Maybe this'll teach {e} to be more careful.'",
-                    ]
-                )
+
+# On average a company sees 1.5 events a day: a fifth of them call-outs, a
+# fifth quitting, and a fifth each of arguments, gossip and injuries. Call-outs
+# and quitting are split evenly between their variants.
+EVENT_RATES: EventRegistry[type[Event]] = EventRegistry(
+    [
+        EventRate(CallOut, 0.1),
+        EventRate(CallOutSick, 0.1),
+        EventRate(CallOutRelativeSick, 0.1),
+        EventRate(QuittingForBetterJob, 0.1),
+        EventRate(QuittingDislikesCoworkers, 0.1),
+        EventRate(QuittingForRelative, 0.1),
+        EventRate(Argument, 0.3),
+        EventRate(Gossip, 0.3),
+        EventRate(Injury, 0.3),
+    ]
+)
 
 
 if __name__ == "__main__":
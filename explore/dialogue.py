@@ -0,0 +1,246 @@
+import random
+from string import Formatter
+from typing import Any, Sequence
+import weakref
+
+from person import Person
+from roster import DISLIKES, HATES, LIKES
+
+# What employees say about an event is declared as a list of `Line`s, checked
+# in order like an if/elif chain:
+#
+#     Line("to", "listener dislikes speaker", "'You owe us an apology.'")
+#
+# A line applies when the speaker's role matches and every condition holds.
+# Roles are "self" (the speaker is in the event), "to" (the listener is),
+# "both", or "about" (neither). Conditions are joined with "and":
+#
+#     "A likes B", "A dislikes B", "A hates B"  how A feels about B
+#     "A content"                               A's disposition is positive
+#     "severe"                                  an attribute of the event
+#
+# where A and B are "speaker", "listener", "other" (the participant the
+# speaker or listener isn't) or one of the event's fields. Templates use the
+# same names, with pronouns as attributes: "{employee.They} quit."
+#
+# Everything a line depends on is boiled down to a small key (role, feelings,
+# contentment, flags). Templates are parsed once, the line for a key is picked
+# once per event class, and a line is rendered once per event and the people
+# it names (as they're named at the time). Renderings are kept by the `Dialogue`,
+# not on the events or people, and only for as long as those are around.
+
+
+def feeling(value: float) -> str:
+    if value > LIKES:
+        return "likes"
+    if value < HATES:
+        return "hates"
+    if value < DISLIKES:
+        return "dislikes"
+    return "neutral"
+
+
+# `feeling` buckets that satisfy each relation; hating someone is also
+# disliking them.
+RELATIONS = {
+    "likes": {"likes"},
+    "dislikes": {"dislikes", "hates"},
+    "hates": {"hates"},
+}
+
+
+class Line:
+    def __init__(self, roles: str, when: str, *templates: str):
+        self.roles = set(roles.split())
+        self.conditions = [c.split() for c in when.split(" and ") if c]
+        self.templates = [_compile(t) for t in templates]
+
+        self.names = list(
+            dict.fromkeys(name for t in self.templates for _, name, _ in t if name)
+        )
+
+
+class Dialogue:
+    def __init__(self, participants: Sequence[str], *lines: Line):
+        self.participants = participants
+        self.lines = lines
+
+        # For each role, everything its lines look at, which is what the key
+        # for a speaker and listener in that role has to cover.
+        self.pairs: dict[str, list[tuple[str, str]]] = {}
+        self.content: dict[str, list[str]] = {}
+        self.flags: dict[str, list[str]] = {}
+        for line in lines:
+            for role in line.roles:
+                pairs = self.pairs.setdefault(role, [])
+                content = self.content.setdefault(role, [])
+                flags = self.flags.setdefault(role, [])
+                for condition in line.conditions:
+                    match condition:
+                        case [a, relation, b] if relation in RELATIONS:
+                            _add(pairs, (a, b))
+                        case [a, "content"]:
+                            _add(content, a)
+                        case [flag]:
+                            _add(flags, flag)
+                        case _:
+                            raise ValueError(f"bad condition: {' '.join(condition)}")
+
+        self.by_key: dict[tuple, Line] = {}
+        # Each event's renderings, by `id(event)` since events compare by
+        # value, dropped along with the event.
+        self.said: dict[int, tuple[weakref.KeyedRef, dict[tuple, list[str]]]] = {}
+        # Everything a template can say about each person.
+        self.forms: weakref.WeakKeyDictionary[Person, dict[str, str]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def render(
+        self, event, speaker: Person, listener: Person, rng: random.Random
+    ) -> str:
+        people = self._people(event, speaker, listener)
+        key = self._key(event, people)
+        line = self.by_key.get(key)
+        if line is None:
+            line = self.by_key[key] = self._line(key)
+
+        # A line about the same people, going by the same names, always
+        # renders the same way, so e.g. every bystander shares one rendering of
+        # a call-out.
+        values = tuple(
+            people[name] if name in people else getattr(event, name)
+            for name in line.names
+        )
+        memo = (
+            key,
+            *[(v.id, str(v)) if isinstance(v, Person) else None for v in values],
+        )
+        said = self._said(event)
+        rendered = said.get(memo)
+        if rendered is None:
+            context = {
+                name: self._forms(v) if isinstance(v, Person) else v
+                for name, v in zip(line.names, values)
+            }
+            rendered = said[memo] = [_render(t, context) for t in line.templates]
+        return rendered[0] if len(rendered) == 1 else rng.choice(rendered)
+
+    def _said(self, event) -> dict[tuple, list[str]]:
+        key = id(event)
+        found = self.said.get(key)
+        if found is not None and found[0]() is event:
+            return found[1]
+        said = {}
+        self.said[key] = (weakref.KeyedRef(event, self._forget, key), said)
+        return said
+
+    def _forget(self, ref: weakref.KeyedRef):
+        self.said.pop(ref.key, None)
+
+    def _forms(self, p: Person) -> dict[str, str]:
+        # `p`'s name under "", and their pronouns, worked out again only once
+        # they go by another name.
+        name = str(p)
+        found = self.forms.get(p)
+        if found is None or found[""] != name:
+            found = {"": name, "first_name": p.first_name, "last_name": p.last_name}
+            for pronoun in PRONOUNS:
+                form = getattr(p, pronoun)
+                found[pronoun] = form
+                found[pronoun.capitalize()] = form.capitalize()
+            self.forms[p] = found
+        return found
+
+    def _people(self, event, speaker: Person, listener: Person) -> dict[str, Any]:
+        people = {name: getattr(event, name) for name in self.participants}
+        involved = [p.id for p in people.values()]
+        speaking, spoken_to = speaker.id in involved, listener.id in involved
+        if speaking:
+            others = [p for p in people.values() if p.id != speaker.id]
+        else:
+            others = [p for p in people.values() if p.id != listener.id]
+        people["speaker"] = speaker
+        people["listener"] = listener
+        people["other"] = others[0] if len(others) == 1 else None
+        people["role"] = (
+            ("both" if spoken_to else "self")
+            if speaking
+            else ("to" if spoken_to else "about")
+        )
+        return people
+
+    def _key(self, event, people: dict[str, Any]) -> tuple:
+        role = people["role"]
+        feelings = content = flags = ()
+        if pairs := self.pairs.get(role):
+            feelings = []
+            for a, b in pairs:
+                a = people[a] if a in people else getattr(event, a)
+                b = people[b] if b in people else getattr(event, b)
+                if a is None or b is None:
+                    feelings.append(None)
+                else:
+                    feelings.append(feeling(a.relationships[b]))
+            feelings = tuple(feelings)
+        if names := self.content.get(role):
+            content = tuple(
+                (
+                    people[a] if a in people else getattr(event, a)
+                ).disposition_toward_company
+                > 0.0
+                for a in names
+            )
+        if names := self.flags.get(role):
+            flags = tuple(bool(getattr(event, flag)) for flag in names)
+        return role, feelings, content, flags
+
+    def _line(self, key: tuple) -> Line:
+        role, feelings, content, flags = key
+        feelings = dict(zip(self.pairs.get(role, ()), feelings))
+        content = dict(zip(self.content.get(role, ()), content))
+        flags = dict(zip(self.flags.get(role, ()), flags))
+        for line in self.lines:
+            if role in line.roles and all(
+                _holds(c, feelings, content, flags) for c in line.conditions
+            ):
+                return line
+        raise LookupError(f"nothing to say for {key}")
+
+
+def _holds(condition: list[str], feelings, content, flags) -> bool:
+    match condition:
+        case [a, relation, b]:
+            return feelings[(a, b)] in RELATIONS[relation]
+        case [a, "content"]:
+            return content[a]
+        case [flag]:
+            return flags[flag]
+
+
+def _add(items: list, item):
+    if item not in items:
+        items.append(item)
+
+
+def _compile(template: str) -> tuple:
+    # A template as (literal, name, attribute) parts, parsed once.
+    parts = []
+    for literal, field, _, _ in Formatter().parse(template):
+        name, attr = None, ""
+        if field is not None:
+            name, _, attr = field.partition(".")
+        parts.append((literal, name, attr))
+    return tuple(parts)
+
+
+def _render(template: tuple, context: dict[str, Any]) -> str:
+    out = []
+    for literal, name, attr in template:
+        out.append(literal)
+        if name is not None:
+            value = context[name]
+            out.append(value[attr] if isinstance(value, dict) else str(value))
+    return "".join(out)
+
+
+PRONOUNS = ["they", "them", "their", "theyre"]
@@ -0,0 +1,219 @@
+import dataclasses
+import json
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from person import Person
+
+
+class EventLog:
+    # Append-only record of what happened at a company.
+    #
+    # Only the current day's events are kept as objects (`todays_events`, which
+    # is what the talk and listen menus read). When the next day starts they
+    # are packed into typed columns: the day, a kind code, the ids of the
+    # people involved, any numbers, and any text, interned into `texts`. So the
+    # log doesn't keep event objects, or departed employees, alive.
+    #
+    # With `retention_days` set, older rows are dropped from memory; with
+    # `spill_path` also set, they are appended to that file first.
+
+    def __init__(
+        self,
+        kinds: Sequence[type],
+        retention_days: Optional[int] = None,
+        spill_path: Optional[str] = None,
+    ):
+        self.kinds: list[type] = []
+        self.layouts: list[list[tuple[str, str, int]]] = []
+        self.codes: dict[type, int] = {}
+        self.slots = {"people": 1, "numbers": 1, "texts": 1}
+        for kind in kinds:
+            self._register(kind)
+        self.dtype = np.dtype(
+            [
+                ("day", np.int32),
+                ("kind", np.uint8),
+                ("people", np.int64, (self.slots["people"],)),
+                ("numbers", np.int32, (self.slots["numbers"],)),
+                ("texts", np.int32, (self.slots["texts"],)),
+            ]
+        )
+
+        self.texts: list[str] = []
+        self.text_codes: dict[str, int] = {}
+
+        self.rows = np.zeros(64, dtype=self.dtype)
+        self.size = 0
+        self.retention_days = retention_days
+        self.spill_path = spill_path
+
+        self.today = 0
+        self.todays_events: list = []
+
+    def __len__(self) -> int:
+        return self.size + len(self.todays_events)
+
+    def record(self, event):
+        self.todays_events.append(event)
+
+    def start_day(self, day: int):
+        for event in self.todays_events:
+            self._append(self.today, event)
+        self.todays_events = []
+        self.today = day
+
+        if self.retention_days is not None:
+            self._drop_before(day - self.retention_days)
+
+    def records(self, since_day: Optional[int] = None) -> np.ndarray:
+        # Archived rows (everything before today), oldest first.
+        rows = self.rows[: self.size]
+        if since_day is not None:
+            rows = rows[rows["day"] >= since_day]
+        return rows
+
+    def events_on(self, day: int, resolve: Callable[[int], Optional[Person]]) -> list:
+        # Rebuilds the event objects for `day`. `resolve` maps a person id back
+        # to the person, or `None` if they're no longer around.
+        if day == self.today:
+            return list(self.todays_events)
+        rows = self.records(since_day=day)
+        return [self._unpack(row, resolve) for row in rows[rows["day"] == day]]
+
+    def kind_name(self, code: int) -> str:
+        return self.kinds[code].__name__
+
+    def to_rows(self) -> np.ndarray:
+        # Every row, today's events included (at the end), for saving.
+        today = np.zeros(len(self.todays_events), dtype=self.dtype)
+        for i, event in enumerate(self.todays_events):
+            self._fill(today[i], self.today, event)
+        return np.concatenate([self.rows[: self.size], today])
+
+    def load_rows(
+        self,
+        rows: np.ndarray,
+        texts: list[str],
+        today: int,
+        resolve: Callable[[int], Optional[Person]],
+    ):
+        # Inverse of `to_rows`: replaces this log's contents.
+        if rows.dtype != self.dtype:
+            raise ValueError("event rows don't match this log's layout")
+        self.texts = list(texts)
+        self.text_codes = {text: i for i, text in enumerate(self.texts)}
+        self.today = today
+        n = int(np.searchsorted(rows["day"], today))
+        self.rows = np.array(rows[:n], dtype=self.dtype)
+        self.size = n
+        self.todays_events = [self._unpack(row, resolve) for row in rows[n:]]
+
+    def _register(self, kind: type) -> int:
+        layout = []
+        used = {"people": 0, "numbers": 0, "texts": 0}
+        for f in dataclasses.fields(kind):
+            if isinstance(f.type, type) and issubclass(f.type, Person):
+                column = "people"
+            elif f.type in (int, bool):
+                column = "numbers"
+            elif f.type is str:
+                column = "texts"
+            else:
+                raise TypeError(f"can't log {kind.__name__}.{f.name}: {f.type!r}")
+            layout.append((f.name, column, used[column]))
+            used[column] += 1
+
+        if hasattr(self, "dtype"):
+            for column, n in used.items():
+                if n > self.slots[column]:
+                    raise ValueError(f"{kind.__name__} doesn't fit this log's rows")
+        else:
+            for column, n in used.items():
+                self.slots[column] = max(self.slots[column], n)
+
+        self.codes[kind] = len(self.kinds)
+        self.kinds.append(kind)
+        self.layouts.append(layout)
+        return self.codes[kind]
+
+    def _intern(self, text: str) -> int:
+        code = self.text_codes.get(text)
+        if code is None:
+            code = self.text_codes[text] = len(self.texts)
+            self.texts.append(text)
+        return code
+
+    def _append(self, day: int, event):
+        if self.size == len(self.rows):
+            self.rows = np.resize(self.rows, max(64, 2 * len(self.rows)))
+        self._fill(self.rows[self.size], day, event)
+        self.size += 1
+
+    def _fill(self, row, day: int, event):
+        code = self.codes.get(type(event))
+        if code is None:
+            code = self._register(type(event))
+        row["day"] = day
+        row["kind"] = code
+        row["people"] = -1
+        row["numbers"] = 0
+        row["texts"] = -1
+        for name, column, slot in self.layouts[code]:
+            value = getattr(event, name)
+            if column == "people":
+                row["people"][slot] = -1 if value is None else value.id
+            elif column == "numbers":
+                row["numbers"][slot] = int(value)
+            else:
+                row["texts"][slot] = self._intern(value)
+
+    def _unpack(self, row, resolve: Callable[[int], Optional[Person]]):
+        kind = self.kinds[row["kind"]]
+        values = {}
+        for name, column, slot in self.layouts[row["kind"]]:
+            if column == "people":
+                person_id = int(row["people"][slot])
+                values[name] = None if person_id < 0 else resolve(person_id)
+            elif column == "numbers":
+                values[name] = kind.__dataclass_fields__[name].type(
+                    row["numbers"][slot]
+                )
+            else:
+                values[name] = self.texts[row["texts"][slot]]
+        # Skip `__init__`, which may re-roll fields (e.g. `Injury.days_off`).
+        event = kind.__new__(kind)
+        event.__dict__.update(values)
+        return event
+
+    def _drop_before(self, day: int):
+        if self.size == 0 or self.rows[0]["day"] >= day:
+            return
+        n = int(np.searchsorted(self.rows["day"][: self.size], day))
+        if self.spill_path is not None:
+            self._spill(self.rows[:n])
+        self.rows[: self.size - n] = self.rows[n : self.size]
+        self.size -= n
+
+    def _spill(self, rows: np.ndarray):
+        with open(self.spill_path, "ab") as f:
+            rows.tofile(f)
+        # Small enough to rewrite whole: what the codes in the rows mean.
+        with open(f"{self.spill_path}.json", "w") as f:
+            json.dump(
+                {
+                    "dtype": self.dtype.descr,
+                    "kinds": [kind.__name__ for kind in self.kinds],
+                    "texts": self.texts,
+                },
+                f,
+            )
+
+
+def read_spilled(path: str) -> tuple[np.ndarray, list[str], list[str]]:
+    # Returns `(rows, kind_names, texts)` from a log's spill file.
+    with open(f"{path}.json") as f:
+        meta = json.load(f)
+    dtype = np.dtype([tuple(field) for field in meta["dtype"]])
+    return np.fromfile(path, dtype=dtype), meta["kinds"], meta["texts"]
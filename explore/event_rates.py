@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Optional, Sequence, TypeVar
+
+import numpy as np
+
+K = TypeVar("K")
+
+
+class AliasTable:
+    # Walker's alias method: O(k) to build for k weights, then O(1) per draw.
+
+    def __init__(self, weights: Sequence[float]):
+        weights = np.asarray(weights, dtype=np.float64)
+        k = len(weights)
+        total = weights.sum()
+        scaled = weights * k / total if total > 0 else np.ones(k)
+
+        self.probability = np.ones(k)
+        self.alias = np.arange(k)
+        small = [i for i in range(k) if scaled[i] < 1.0]
+        large = [i for i in range(k) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.probability[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def draw(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        columns = rng.integers(len(self.probability), size=size)
+        keep = rng.random(size) < self.probability[columns]
+        return np.where(keep, columns, self.alias[columns])
+
+
+@dataclass
+class EventRate(Generic[K]):
+    kind: K
+    per_day: float  # Expected number of these per company per day.
+    # Optional multiplier on `per_day` computed from the company's current
+    # state (e.g. more quitting when morale is low).
+    scale: Optional[Callable[[Any], float]] = None
+
+
+class EventRegistry(Generic[K]):
+    # Each day a company sees a Poisson-distributed number of events, and each
+    # event's kind is drawn in proportion to its rate. The alias table for the
+    # base rates is built once; only registries with state-dependent rates
+    # have to rebuild it per company.
+
+    def __init__(self, rates: list[EventRate[K]]):
+        self.rates = rates
+        self.kinds = [r.kind for r in rates]
+        self.base_rates = np.array([r.per_day for r in rates], dtype=np.float64)
+        self.scaled = [i for i, r in enumerate(rates) if r.scale is not None]
+        self.base_table = AliasTable(self.base_rates)
+
+    def rates_for(self, company) -> np.ndarray:
+        if not self.scaled:
+            return self.base_rates
+        rates = self.base_rates.copy()
+        for i in self.scaled:
+            rates[i] *= max(0.0, self.rates[i].scale(company))
+        return rates
+
+    def roll(self, company, rng: np.random.Generator) -> list[K]:
+        # Today's event kinds for `company`, drawn from its own stream `rng`, so
+        # they don't depend on what other companies are being run alongside.
+        if not self.scaled:
+            n = int(rng.poisson(self.base_rates.sum(), size=1)[0])
+            return [self.kinds[i] for i in self.base_table.draw(rng, n)]
+
+        rates = self.rates_for(company)
+        n = int(rng.poisson(rates.sum(), size=1)[0])
+        return [self.kinds[i] for i in AliasTable(rates).draw(rng, n)] if n else []
@@ -0,0 +1,294 @@
+import argparse
+from dataclasses import dataclass
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+from characters import (
+    EVENT_RATES,
+    CallOut,
+    CallOutSick,
+    Company,
+    Injury,
+    Quitting,
+)
+import snapshot
+
+
+@dataclass
+class Forecast:
+    # One row per simulated future, one column per week (the current week
+    # first, including the hours already worked in it).
+    profit: np.ndarray
+    headcount: np.ndarray
+    elapsed_seconds: float
+
+    @property
+    def trials(self) -> int:
+        return self.profit.shape[0]
+
+    @property
+    def weeks(self) -> int:
+        return self.profit.shape[1]
+
+    @property
+    def probability_of_loss(self) -> np.ndarray:
+        return (self.profit < 0).mean(axis=0)
+
+    def profit_percentiles(
+        self, q: Sequence[float] = (5, 25, 50, 75, 95)
+    ) -> np.ndarray:
+        return np.percentile(self.profit, q, axis=0)
+
+    def headcount_percentiles(
+        self, q: Sequence[float] = (5, 25, 50, 75, 95)
+    ) -> np.ndarray:
+        return np.percentile(self.headcount, q, axis=0)
+
+    def print(self):
+        print("FORECAST")
+        print("--------")
+        print(f"{self.trials} futures in {self.elapsed_seconds:.3f}s")
+        print()
+        q = (5, 25, 50, 75, 95)
+        profit = self.profit_percentiles(q)
+        headcount = self.headcount_percentiles(q)
+        header = "".join(f"{f'p{p}':>8}" for p in q)
+        print(f"{'Week':<6}{header}{'P(loss)':>10}")
+        for week in range(self.weeks):
+            row = "".join(f"{x:>8.2f}" for x in profit[:, week])
+            print(f"{week + 1:<6}{row}{self.probability_of_loss[week]:>10.1%}")
+        print()
+        print(f"{'Week':<6}{header}   (headcount)")
+        for week in range(self.weeks):
+            row = "".join(f"{x:>8.0f}" for x in headcount[:, week])
+            print(f"{week + 1:<6}{row}")
+
+
+def forecast(
+    c: Company,
+    weeks: int = 1,
+    trials: int = 10_000,
+    budget_seconds: Optional[float] = 0.25,
+    rng: Optional[np.random.Generator] = None,
+) -> Forecast:
+    # Profit and headcount over the next `weeks` weeks, simulated for many
+    # possible futures at once. Futures are simulated in batches until there
+    # are `trials` of them or `budget_seconds` runs out (at least one batch
+    # always runs).
+    #
+    # This is a model of the day loop rather than the day loop itself: shifts
+    # go to whoever needs hours most (as with `NeediestFirst`), nobody is
+    # hired, and only the events that change hours or headcount (call-outs,
+    # injuries and quits) are simulated. The company itself isn't changed and
+    # its random streams aren't touched.
+    if rng is None:
+        rng = np.random.default_rng()
+
+    model = _Model(c)
+    # Keep each batch's (futures x employees) arrays to a few million entries.
+    max_batch = max(1, 4_000_000 // max(1, model.n))
+
+    start = time.perf_counter()
+    profits, headcounts = [], []
+    done = 0
+    # Start small, then size batches by how long a future has taken so far.
+    batch = min(trials, max_batch, 8)
+    while batch > 0:
+        profit, headcount = model.run(batch, weeks, rng)
+        profits.append(profit)
+        headcounts.append(headcount)
+        done += batch
+
+        batch = min(trials - done, max_batch)
+        if budget_seconds is not None:
+            elapsed = time.perf_counter() - start
+            batch = min(batch, int((budget_seconds - elapsed) / (elapsed / done)))
+
+    return Forecast(
+        profit=np.concatenate(profits),
+        headcount=np.concatenate(headcounts),
+        elapsed_seconds=time.perf_counter() - start,
+    )
+
+
+class _Model:
+    def __init__(self, c: Company):
+        roster = c.roster
+        self.c = c
+        self.n = roster.size
+        self.active = roster.column("active").copy()
+        self.returns_on_day = roster.column("returns_on_day").copy()
+        self.desired_hours = roster.column("desired_workdays_per_week") * 8
+        self.weekly_hours = roster.column("weekly_hours_worked").copy()
+        self.wages = roster.column("hourly_wage").copy()
+        self.shift_limit = min(c.max_shift_size, self.n)
+
+        # Expected events per day, by what they do.
+        rates = EVENT_RATES.rates_for(c)
+        self.call_out_rate = self.sick_rate = 0.0
+        self.injury_rate = self.quit_rate = 0.0
+        for kind, rate in zip(EVENT_RATES.kinds, rates):
+            if issubclass(kind, CallOutSick):
+                self.sick_rate += rate
+            elif issubclass(kind, CallOut):
+                self.call_out_rate += rate
+            elif issubclass(kind, Injury):
+                self.injury_rate += rate
+            elif issubclass(kind, Quitting):
+                self.quit_rate += rate
+
+    def run(
+        self, trials: int, weeks: int, rng: np.random.Generator
+    ) -> tuple[np.ndarray, np.ndarray]:
+        c = self.c
+        active = np.tile(self.active, (trials, 1))
+        returns_on_day = np.tile(self.returns_on_day, (trials, 1))
+        hours = np.tile(self.weekly_hours, (trials, 1))
+        every = np.arange(trials)
+
+        profit = np.zeros((trials, weeks))
+        headcount = np.zeros((trials, weeks), dtype=np.int64)
+
+        day, day_of_week, week = c.day, c.day_of_week, 0
+        while week < weeks:
+            shift, on_shift = self._schedule(
+                active, returns_on_day, hours, day, day_of_week, rng
+            )
+            extra_hours = np.zeros((trials, self.shift_limit), dtype=hours.dtype)
+            anyone = on_shift.any(axis=1)
+
+            count = self._count(self.call_out_rate, anyone, rng)
+            for k in range(count.max(initial=0)):
+                who = _pick(on_shift, count > k, rng)
+                on_shift[who] = False
+
+            count = self._count(self.sick_rate, anyone, rng)
+            for k in range(count.max(initial=0)):
+                who = _pick(on_shift, count > k, rng)
+                on_shift[who] = False
+                rows = shift[who]
+                returns_on_day[who[0], rows] = day + rng.integers(0, 4, size=len(rows))
+
+            count = self._count(self.injury_rate, anyone, rng)
+            for k in range(count.max(initial=0)):
+                who = _pick(on_shift, count > k, rng)
+                on_shift[who] = False
+                extra_hours[who] += rng.integers(2, 7, size=len(who[0]))
+                severe = rng.random(len(who[0])) < 0.3
+                trial, rows = who[0][severe], shift[who][severe]
+                returns_on_day[trial, rows] = day + rng.integers(7, 15, size=len(rows))
+
+            count = self._count(self.quit_rate, anyone, rng)
+            for k in range(count.max(initial=0)):
+                trial = every[(count > k) & active.any(axis=1)]
+                # Quitters finish the day; they just aren't back tomorrow.
+                scores = np.where(active[trial], rng.random(active[trial].shape), -1)
+                active[trial, scores.argmax(axis=1)] = False
+
+            worked = np.where(on_shift, 8, 0) + extra_hours
+            np.add.at(
+                hours,
+                (np.repeat(every, self.shift_limit), shift.ravel()),
+                worked.ravel(),
+            )
+
+            day += 1
+            day_of_week = (day_of_week + 1) % 7
+            if day_of_week == 0:
+                total_hours = hours.sum(axis=1)
+                pay = hours @ self.wages
+                revenue = total_hours * rng.normal(c.hourly_revenue, 0.05, size=trials)
+                costs = rng.normal(c.weekly_operating_expenses, 2.00, size=trials)
+                profit[:, week] = revenue - costs - pay
+                headcount[:, week] = active.sum(axis=1)
+                hours[:] = 0
+                week += 1
+
+        return profit, headcount
+
+    def _schedule(
+        self,
+        active: np.ndarray,
+        returns_on_day: np.ndarray,
+        hours: np.ndarray,
+        day: int,
+        day_of_week: int,
+        rng: np.random.Generator,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Each future's shift as `shift_limit` roster rows, highest priority
+        # first, and which of those slots are actually filled.
+        c = self.c
+        eligible = active & (returns_on_day <= day) & (hours < self.desired_hours)
+        priority = (self.desired_hours - hours) / 8 / (7 - day_of_week)
+        # Random tie-breaks well below the gap between distinct priorities.
+        score = np.where(
+            eligible, priority + rng.random(priority.shape) * 1e-6, -np.inf
+        )
+
+        k = self.shift_limit
+        if k == 0:
+            empty = np.zeros((len(active), 0), dtype=np.intp)
+            return empty, empty.astype(bool)
+        top = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(score, top, axis=1), axis=1)
+        shift = np.take_along_axis(top, order, axis=1)
+
+        n_eligible = eligible.sum(axis=1)
+        needed = (priority >= 1.0) & eligible
+        shift_size = np.maximum.reduce(
+            [
+                needed.sum(axis=1),
+                (n_eligible + 1) // 2,
+                np.full_like(n_eligible, c.min_shift_size),
+            ]
+        )
+        shift_size = np.minimum(shift_size, np.minimum(c.max_shift_size, n_eligible))
+        on_shift = np.arange(k) < shift_size[:, None]
+        return shift, on_shift
+
+    def _count(
+        self, rate: float, anyone: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        # Today's number of events at `rate` in each future. Like `finish_day`,
+        # nothing happens in a future where nobody is on shift.
+        return np.where(anyone, rng.poisson(rate, size=len(anyone)), 0)
+
+
+def _pick(on_shift: np.ndarray, where: np.ndarray, rng: np.random.Generator):
+    # One random filled slot for each future in `where` that still has one, as
+    # an index into `(futures, slots)` arrays.
+    trial = np.flatnonzero(where & on_shift.any(axis=1))
+    scores = np.where(on_shift[trial], rng.random(on_shift[trial].shape), -1)
+    return trial, scores.argmax(axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Forecast a newly generated company's profit and headcount."
+    )
+    parser.add_argument("-w", "--weeks", type=int, default=4)
+    parser.add_argument("-t", "--trials", type=int, default=10_000)
+    parser.add_argument(
+        "--budget", type=float, default=0.25, help="time budget in seconds"
+    )
+    parser.add_argument("--snapshot", help="forecast a saved company instead")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.snapshot is not None:
+        c = snapshot.load(args.snapshot)
+    else:
+        c = Company.generate(args.seed)
+    forecast(
+        c,
+        weeks=args.weeks,
+        trials=args.trials,
+        budget_seconds=args.budget,
+        rng=np.random.default_rng(args.seed),
+    ).print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from collections.abc import Iterable, Iterator, MutableSet
+import random
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class IndexedSet(MutableSet, Generic[T]):
+    # A set that also keeps its items packed in a list, so drawing a random item
+    # is O(1) instead of copying the whole set into a list first. Removing an
+    # item moves the last item into its slot.
+
+    def __init__(self, items: Iterable[T] = ()):
+        self.items: list[T] = list(dict.fromkeys(items))
+        self.positions: dict[T, int] = {item: i for i, item in enumerate(self.items)}
+
+    def __contains__(self, item) -> bool:
+        return item in self.positions
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __repr__(self) -> str:
+        return f"IndexedSet({self.items!r})"
+
+    def add(self, item: T):
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item: T):
+        i = self.positions.pop(item, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.positions[last] = i
+
+    def choice(self, rng: random.Random) -> T:
+        if not self.items:
+            raise IndexError("choice from an empty IndexedSet")
+        return self.items[rng.randrange(len(self.items))]
+
+    def choice_excluding(self, excluded: T, rng: random.Random) -> T:
+        # Like `choice`, but never returns `excluded`.
+        skip = self.positions.get(excluded)
+        if skip is None:
+            return self.choice(rng)
+        if len(self.items) < 2:
+            raise IndexError("no items left to choose from")
+        i = rng.randrange(len(self.items) - 1)
+        if i >= skip:
+            i += 1
+        return self.items[i]
+
+    def sample(self, k: int, rng: random.Random) -> list[T]:
+        return [self.items[i] for i in rng.sample(range(len(self.items)), k)]
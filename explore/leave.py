@@ -0,0 +1,87 @@
+from collections import defaultdict
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Iterator
+
+import numpy as np
+
+from roster import Roster
+
+if TYPE_CHECKING:
+    from characters import Employee
+
+
+class LeaveCalendar:
+    # Keeps track of who is out (sick, injured, or hasn't started yet) by the
+    # day they come back, so rolling over to a new day only touches the people
+    # returning that day. The roster's `available` column is the set of people
+    # who aren't out.
+
+    def __init__(self, roster: Roster):
+        self.roster = roster
+        # Day -> rows due back that day. Entries are left behind when someone's
+        # return day changes; they are ignored when their day comes.
+        self.returning: defaultdict[int, list[int]] = defaultdict(list)
+
+    def days_out(self, row: int, today: int) -> int:
+        return max(0, int(self.roster.returns_on_day[row]) - today)
+
+    def send_away(self, row: int, days: int, today: int):
+        returns_on_day = today + days
+        self.roster.returns_on_day[row] = returns_on_day
+        if days > 0:
+            self.roster.available[row] = False
+            self.returning[returns_on_day].append(row)
+        else:
+            self.roster.available[row] = self.roster.active[row]
+
+    def rebuild(self, today: int):
+        # Fills in `returning` from the roster, e.g. after loading it.
+        returns_on_day = self.roster.column("returns_on_day")
+        rows = np.flatnonzero(returns_on_day > today)
+        days = returns_on_day[rows]
+        order = np.argsort(days, kind="stable")
+        rows, days = rows[order], days[order]
+        starts = np.flatnonzero(np.diff(days, prepend=-1))
+        for day, group in zip(days[starts].tolist(), np.split(rows, starts[1:])):
+            self.returning[day].extend(group.tolist())
+
+    def start_day(self, today: int):
+        rows = self.returning.pop(today, None)
+        if not rows:
+            return
+        rows = np.array(rows, dtype=np.intp)
+        back = (self.roster.returns_on_day[rows] == today) & self.roster.active[rows]
+        self.roster.available[rows[back]] = True
+
+
+class LeaveView(MutableMapping):
+    # Dict-style access to how many more days each employee is out for.
+    # Employees who aren't on the roster read as 0.
+
+    def __init__(self, calendar: LeaveCalendar, today: int):
+        self.calendar = calendar
+        self.today = today
+
+    def __getitem__(self, e: "Employee") -> int:
+        if e._roster is not self.calendar.roster:
+            return 0
+        return self.calendar.days_out(e._row, self.today)
+
+    def __setitem__(self, e: "Employee", days: int):
+        if e._roster is not self.calendar.roster:
+            raise KeyError(e)
+        self.calendar.send_away(e._row, days, self.today)
+
+    def __delitem__(self, e: "Employee"):
+        self[e] = 0
+
+    def _rows_out(self) -> np.ndarray:
+        roster = self.calendar.roster
+        return np.flatnonzero(roster.column("returns_on_day") > self.today)
+
+    def __iter__(self) -> Iterator["Employee"]:
+        for row in self._rows_out():
+            yield self.calendar.roster.members[row]
+
+    def __len__(self) -> int:
+        return len(self._rows_out())
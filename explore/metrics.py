@@ -0,0 +1,108 @@
+from collections import defaultdict
+from dataclasses import dataclass
+import functools
+import json
+import time
+from typing import Any, Callable, Optional
+
+# Optional timing of the day loop, phase by phase. Hand a company a `Metrics`
+# and every `@measured` method it runs is counted:
+#
+#     c.metrics = Metrics()
+#     ...
+#     c.metrics.write_prometheus("day.prom")
+#
+# Several companies can share one `Metrics`. Phases nest (`start_of_day` also
+# counts the `create_todays_schedule` it calls), so their times don't add up
+# to the whole day. With `metrics` left as `None`, the only cost is a function
+# call and an attribute check.
+
+
+@dataclass
+class Phase:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    # Employees each call acted on, summed; what counts depends on the phase.
+    employees_touched: int = 0
+
+
+class Metrics:
+    def __init__(self):
+        self.phases: defaultdict[str, Phase] = defaultdict(Phase)
+
+    def record(self, phase: str, seconds: float, employees_touched: int = 0):
+        p = self.phases[phase]
+        p.calls += 1
+        p.seconds += seconds
+        p.max_seconds = max(p.max_seconds, seconds)
+        p.employees_touched += employees_touched
+
+    def reset(self):
+        self.phases.clear()
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {**p.__dict__, "mean_seconds": p.seconds / p.calls}
+            for name, p in sorted(self.phases.items())
+        }
+
+    def prometheus(self, prefix: str = "company") -> str:
+        # The text exposition format, one counter per statistic.
+        lines = []
+        for stat, kind, doc in [
+            ("calls", "counter", "Calls to each phase of the day loop."),
+            ("seconds", "counter", "Wall time spent in each phase."),
+            ("max_seconds", "gauge", "Longest single call to each phase."),
+            ("employees_touched", "counter", "Employees each phase acted on."),
+        ]:
+            name = f"{prefix}_phase_{stat}" + ("_total" if kind == "counter" else "")
+            lines.append(f"# HELP {name} {doc}")
+            lines.append(f"# TYPE {name} {kind}")
+            for phase, p in sorted(self.phases.items()):
+                lines.append(f'{name}{{phase="{phase}"}} {getattr(p, stat)}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_prometheus(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.prometheus())
+
+    def print(self):
+        print("PHASES")
+        print("------")
+        print(f"{'Phase':<36}{'calls':>9}{'total':>11}{'mean':>11}{'touched':>10}")
+        for name, s in self.summary().items():
+            print(
+                f"{name:<36}{s['calls']:>9}{s['seconds']:>10.3f}s"
+                f"{s['mean_seconds'] * 1e6:>9.1f}us{s['employees_touched']:>10}"
+            )
+
+
+def measured(
+    phase: str,
+    company_arg: int = 0,
+    touched: Optional[Callable[[tuple, Any], int]] = None,
+):
+    # Records calls to the decorated function under `phase` whenever the
+    # company (its `company_arg`th argument) has metrics on. `touched` works
+    # out how many employees a call acted on from its arguments and result.
+    def decorate(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            metrics = args[company_arg].metrics
+            if metrics is None:
+                return f(*args, **kwargs)
+            start = time.perf_counter()
+            result = f(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            n = 0 if touched is None else touched(args, result)
+            metrics.record(phase, elapsed, n)
+            return result
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,136 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+from person import Person
+
+P = TypeVar("P", bound=Person)
+
+
+class NameIndex(Generic[P]):
+    # Case-insensitive lookup of people by nickname, first name, last name or
+    # full name. Keys are also kept sorted so that a prefix lookup is a binary
+    # search rather than a scan over everyone.
+
+    def __init__(self):
+        self.people_by_key: defaultdict[str, set[P]] = defaultdict(set)
+        self.keys_by_person: dict[P, list[str]] = {}
+
+        # Adding and removing people doesn't touch `sorted_keys`: new keys wait
+        # in `unsorted_keys` until the next prefix lookup sorts them in, and
+        # keys nobody has anymore are skipped until there are enough of them
+        # to be worth compacting away. Every key is in exactly one of the two
+        # lists, stale or not.
+        self.sorted_keys: list[str] = []
+        self.unsorted_keys: list[str] = []
+        self.stale_keys: set[str] = set()
+
+        # Set by `rebuild_from`, until the index is next used.
+        self.source: Optional[Callable[[], Iterable[P]]] = None
+
+    def __len__(self) -> int:
+        self._build()
+        return len(self.keys_by_person)
+
+    def rebuild_from(self, people: Callable[[], Iterable[P]]):
+        # Empties the index and has it built again from `people()` the next
+        # time it's used. Until then adding and removing people does nothing,
+        # as `people()` already has them.
+        self.people_by_key.clear()
+        self.keys_by_person.clear()
+        self.sorted_keys.clear()
+        self.unsorted_keys.clear()
+        self.stale_keys.clear()
+        self.source = people
+
+    def add(self, p: P):
+        if self.source is not None:
+            return
+        keys = name_keys(p)
+        self.keys_by_person[p] = keys
+        for key in keys:
+            people = self.people_by_key[key]
+            if not people:
+                if key in self.stale_keys:
+                    # Still listed from before; it just stops being stale.
+                    self.stale_keys.discard(key)
+                else:
+                    self.unsorted_keys.append(key)
+            people.add(p)
+
+    def remove(self, p: P):
+        if self.source is not None:
+            return
+        for key in self.keys_by_person.pop(p):
+            people = self.people_by_key[key]
+            people.discard(p)
+            if not people:
+                del self.people_by_key[key]
+                self.stale_keys.add(key)
+
+    def update(self, p: P):
+        # Call after changing someone's name (e.g. giving them a nickname).
+        self.remove(p)
+        self.add(p)
+
+    def find(self, query: str, limit: int = 10) -> list[P]:
+        # Everyone with a name exactly matching `query`, or if nobody does,
+        # everyone with a name starting with it. At most `limit` are returned,
+        # in order of id for each name.
+        query = " ".join(query.lower().split())
+        if not query:
+            return []
+        self._build()
+
+        exact = self.people_by_key.get(query)
+        if exact:
+            return sorted(exact, key=_by_id)[:limit]
+
+        self._sort_keys()
+        found: dict[P, None] = {}
+        i = bisect_left(self.sorted_keys, query)
+        while i < len(self.sorted_keys) and len(found) < limit:
+            key = self.sorted_keys[i]
+            if not key.startswith(query):
+                break
+            for p in sorted(self.people_by_key.get(key, ()), key=_by_id):
+                found[p] = None
+                if len(found) == limit:
+                    break
+            i += 1
+        return list(found)
+
+    def _build(self):
+        if self.source is None:
+            return
+        people, self.source = self.source, None
+        for p in people():
+            self.add(p)
+
+    def _sort_keys(self):
+        if len(self.stale_keys) > len(self.people_by_key):
+            self.sorted_keys = sorted(self.people_by_key)
+            self.unsorted_keys.clear()
+            self.stale_keys.clear()
+        elif self.unsorted_keys:
+            # Timsort merges the new keys into the already-sorted run in
+            # roughly linear time.
+            self.sorted_keys += self.unsorted_keys
+            self.sorted_keys.sort()
+            self.unsorted_keys.clear()
+
+
+def _by_id(p: Person) -> int:
+    return p.id
+
+
+def name_keys(p: Person) -> list[str]:
+    keys = [
+        p.first_name,
+        p.last_name,
+        f"{p.first_name} {p.last_name}",
+        p.full_name(),
+    ]
+    if p.nickname is not None:
+        keys += [p.nickname, f"{p.nickname} {p.last_name}"]
+    return list(dict.fromkeys(key.lower() for key in keys))
@@ -1,8 +1,12 @@
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import dataclass, field
+from enum import IntFlag
+import functools
 import random
+from statistics import NormalDist
 from typing import Collection, Iterator, Optional
 
+import numpy as np
+
 
 @dataclass
 class Person:
@@ -10,20 +14,22 @@ class Person:
     last_name: str
 
     age: int
-    traits: set["Trait"]
+    traits: "Trait"
 
     middle_initial: Optional[str] = None
     nickname: Optional[str] = None
 
+    # Identity is assigned once at creation and never changes, so renaming
+    # someone (e.g. giving them a nickname) doesn't change who they are. It's
+    # drawn from the same random stream as the rest of the person (see
+    # `new_id`), so ids don't depend on what else was made in the process.
+    id: int = field(kw_only=True, repr=False)
+
     def __hash__(self):
-        return hash((self.first_name, self.middle_initial, self.last_name))
+        return self.id
 
-    def __eq__(self, value: "Person"):
-        return (
-            self.first_name == value.first_name
-            and self.middle_initial == value.middle_initial
-            and self.last_name == value.last_name
-        )
+    def __eq__(self, value: object):
+        return isinstance(value, Person) and self.id == value.id
 
     def full_name(self) -> str:
         match (self.nickname, self.middle_initial):
@@ -43,10 +49,10 @@ class Person:
             return self.first_name
 
     def is_masc(self) -> bool:
-        return Trait.Masc in self.traits
+        return bool(self.traits & Trait.Masc)
 
     def is_fem(self) -> bool:
-        return Trait.Femm in self.traits
+        return bool(self.traits & Trait.Femm)
 
     def sex_descriptor(self) -> str:
         if self.is_fem():
@@ -57,72 +63,88 @@ class Person:
             return "?"
 
     def is_queer(self) -> bool:
-        return Trait.VisQueer in self.traits
+        return bool(self.traits & Trait.VisQueer)
 
     def is_old(self) -> bool:
-        return Trait.Old in self.traits
+        return bool(self.traits & Trait.Old)
 
     def is_young(self) -> bool:
-        return Trait.Young in self.traits
+        return bool(self.traits & Trait.Young)
 
     @staticmethod
-    def generate(min_age: int = 16, max_age: int = 80) -> "Person":
-        traits = set()
+    def generate(rng: random.Random, min_age: int = 16, max_age: int = 80) -> "Person":
+        traits = Trait(0)
 
-        g = random.uniform(-1, 1)
+        g = rng.uniform(-1, 1)
         if -0.1 < g < 0.1:
-            traits.add(Trait.VisQueer)
+            traits |= Trait.VisQueer
         elif g < 0:
-            traits.add(Trait.Masc)
+            traits |= Trait.Masc
         else:
-            traits.add(Trait.Femm)
+            traits |= Trait.Femm
 
-        q = random.uniform(0, 1)
+        q = rng.uniform(0, 1)
         if q > 0.9:
-            traits.add(Trait.VisQueer)
+            traits |= Trait.VisQueer
 
-        if (Trait.Femm in traits or Trait.Masc in traits) and Trait.VisQueer in traits:
-            traits.add(Trait.Gay)
+        if traits & (Trait.Femm | Trait.Masc) and traits & Trait.VisQueer:
+            traits |= Trait.Gay
 
         age = -1000
         while not (min_age <= age <= max_age):
-            age = round(random.gauss(mu=35, sigma=(max_age - min_age) / 3))
+            age = round(rng.gauss(mu=35, sigma=(max_age - min_age) / 3))
 
         if age > 55:
-            traits.add(Trait.Old)
+            traits |= Trait.Old
 
         if age < 25:
-            traits.add(Trait.Young)
+            traits |= Trait.Young
 
         # Choose name
-        if Trait.Femm in traits:
+        if traits & Trait.Femm:
             first_name = FEMININE_NAMES
-        elif Trait.Masc in traits:
+        elif traits & Trait.Masc:
             first_name = MASCULINE_NAMES
         else:
             first_name = NEUTRAL_NAMES
 
-        first_name = random.choice(first_name)
+        first_name = rng.choice(first_name)
 
-        last_name = random.choice(LAST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
 
         return Person(
-            first_name=first_name, last_name=last_name, age=age, traits=traits
+            first_name=first_name,
+            last_name=last_name,
+            age=age,
+            traits=traits,
+            id=new_id(rng),
         )
 
+    @staticmethod
+    def generate_many(
+        n: int,
+        rng: np.random.Generator,
+        min_age: int = 16,
+        max_age: int = 80,
+    ) -> list["Person"]:
+        # Same distribution as `generate`, drawn for everyone at once.
+        return [
+            Person(first_name, last_name, age, traits, id=person_id)
+            for first_name, last_name, age, traits, person_id in draw_people(
+                n, rng, min_age, max_age
+            )
+        ]
+
     @staticmethod
     def give_distinguishing_nicknames(
-        people: Collection["Person"], used_nicknames: set[str]
+        people: Collection["Person"], nicknames: "NicknamePool"
     ) -> None:
-        used_nicknames.update({p.nickname for p in people if p.nickname is not None})
         for p in people:
             if p.nickname is not None:
-                continue
-            nickname = random.choice(NICKNAMES)
-            while nickname in used_nicknames:
-                nickname = random.choice(NICKNAMES)
-            p.nickname = nickname
-            used_nicknames.add(nickname)
+                nicknames.claim(p.nickname)
+        for p in people:
+            if p.nickname is None:
+                p.nickname = nicknames.draw()
 
     @property
     def they(self) -> str:
@@ -177,16 +199,180 @@ class Person:
         return self.theyre.capitalize()
 
 
-class Trait(Enum):
-    Masc = "masculine"
-    Femm = "feminine"
-    VisQueer = "visibly queer"
-    Gay = "gay"
-    Old = "old"
-    Young = "young"
+class NicknamePool:
+    # Hands out unused nicknames in random order. Once every nickname is taken
+    # the pool refills itself with prefixed variants ("Big Tex"), and after those
+    # with numbered ones ("Tex II"), so drawing never runs out.
+
+    PREFIXES = ["Big", "Little", "Old", "Young", "Slim"]
+
+    def __init__(self, nicknames: Collection[str] = (), *, rng: random.Random):
+        self.base = list(dict.fromkeys(nicknames or NICKNAMES))
+        self.rng = rng
+        self.used: set[str] = set()
+        # May hold names that were claimed after being added; `draw` skips them.
+        self.free: list[str] = []
+        self.refills = 0
+
+    def draw(self) -> str:
+        while True:
+            if not self.free:
+                self._refill()
+            nickname = self.free.pop()
+            if nickname not in self.used:
+                self.used.add(nickname)
+                return nickname
+
+    def claim(self, nickname: str):
+        self.used.add(nickname)
+
+    def release(self, nickname: str):
+        if nickname not in self.used:
+            return
+        self.used.remove(nickname)
+        # Put it back at a random position so it isn't simply drawn next.
+        self.free.append(nickname)
+        i = self.rng.randrange(len(self.free))
+        self.free[i], self.free[-1] = self.free[-1], self.free[i]
+
+    def _refill(self):
+        n = self.refills
+        self.refills += 1
+        if n == 0:
+            names = self.base
+        elif n <= len(self.PREFIXES):
+            names = [f"{self.PREFIXES[n - 1]} {name}" for name in self.base]
+        else:
+            numeral = _roman(n - len(self.PREFIXES) + 1)
+            names = [f"{name} {numeral}" for name in self.base]
+
+        self.free = [name for name in names if name not in self.used]
+        self.rng.shuffle(self.free)
+
+
+def _roman(n: int) -> str:
+    numerals = [
+        (1000, "M"),
+        (900, "CM"),
+        (500, "D"),
+        (400, "CD"),
+        (100, "C"),
+        (90, "XC"),
+        (50, "L"),
+        (40, "XL"),
+        (10, "X"),
+        (9, "IX"),
+        (5, "V"),
+        (4, "IV"),
+        (1, "I"),
+    ]
+    out = ""
+    for value, numeral in numerals:
+        count, n = divmod(n, value)
+        out += numeral * count
+    return out
+
+
+def draw_people(
+    n: int,
+    rng: np.random.Generator,
+    min_age: int = 16,
+    max_age: int = 80,
+) -> Iterator[tuple[str, str, int, "Trait", int]]:
+    # Yields `(first_name, last_name, age, traits, id)` for `n` people.
+
+    g = rng.uniform(-1, 1, size=n)
+    queer = (np.abs(g) < 0.1) | (rng.uniform(0, 1, size=n) > 0.9)
+    masc = g <= -0.1
+    femm = g >= 0.1
+    gay = (masc | femm) & queer
+
+    ages, age_weights = _age_distribution(min_age, max_age)
+    age = rng.choice(ages, size=n, p=age_weights)
+    old = age > 55
+    young = age < 25
+
+    first_names = np.empty(n, dtype=object)
+    for names, who in [
+        (FEMININE_NAMES, femm),
+        (MASCULINE_NAMES, masc),
+        (NEUTRAL_NAMES, ~(masc | femm)),
+    ]:
+        picks = rng.integers(len(names), size=np.count_nonzero(who))
+        first_names[who] = np.array(names, dtype=object)[picks]
+    last_names = np.array(LAST_NAMES, dtype=object)[
+        rng.integers(len(LAST_NAMES), size=n)
+    ]
+
+    codes = np.zeros(n, dtype=np.uint8)
+    for trait, has_trait in [
+        (Trait.Masc, masc),
+        (Trait.Femm, femm),
+        (Trait.VisQueer, queer),
+        (Trait.Gay, gay),
+        (Trait.Old, old),
+        (Trait.Young, young),
+    ]:
+        codes[has_trait] |= np.uint8(trait)
+
+    return zip(
+        first_names.tolist(),
+        last_names.tolist(),
+        age.tolist(),
+        map(traits_for_code, codes.tolist()),
+        rng.integers(ID_LIMIT, size=n, dtype=np.int64).tolist(),
+    )
+
+
+# Ids are random 63-bit numbers, so people made by different companies, worker
+# processes or snapshots are all but certain never to share one, while each
+# company's own people still come out the same from the same seed.
+ID_LIMIT = 2**63
+
+
+def new_id(rng: random.Random) -> int:
+    return rng.randrange(ID_LIMIT)
+
+
+@functools.cache
+def _age_distribution(min_age: int, max_age: int) -> tuple[np.ndarray, np.ndarray]:
+    # Exact probabilities of `generate`'s rejection loop: a normal, rounded to
+    # whole years and truncated to `[min_age, max_age]`.
+    dist = NormalDist(mu=35, sigma=(max_age - min_age) / 3)
+    ages = np.arange(min_age, max_age + 1)
+    weights = np.array([dist.cdf(a + 0.5) - dist.cdf(a - 0.5) for a in ages])
+    return ages, weights / weights.sum()
+
+
+class Trait(IntFlag):
+    # A person's traits as bits, so they fit in a small integer roster column
+    # and a whole population can be filtered with one mask operation.
+    Masc = 1
+    Femm = 2
+    VisQueer = 4
+    Gay = 8
+    Old = 16
+    Young = 32
 
     def __str__(self):
-        return self.value
+        return ", ".join(_TRAIT_LABELS[trait] for trait in self)
+
+
+_TRAIT_LABELS = {
+    Trait.Masc: "masculine",
+    Trait.Femm: "feminine",
+    Trait.VisQueer: "visibly queer",
+    Trait.Gay: "gay",
+    Trait.Old: "old",
+    Trait.Young: "young",
+}
+
+# Every combination of traits, indexed by its value; cheaper than `Trait(code)`.
+_TRAIT_COMBOS = [Trait(code) for code in range(1 << len(Trait))]
+
+
+def traits_for_code(code: int) -> Trait:
+    return _TRAIT_COMBOS[code]
 
 
 NEUTRAL_NAMES = [
@@ -441,6 +627,7 @@ LAST_NAMES = [
 ]
 
 if __name__ == "__main__":
+    rng = random.Random()
     for _ in range(10):
-        p = Person.generate()
+        p = Person.generate(rng)
         print(p, p.age, p.traits)
@@ -0,0 +1,184 @@
+from collections.abc import Collection
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
+
+from roster import DISLIKES, HATES, LIKES, Roster
+
+if TYPE_CHECKING:
+    from characters import Company, Employee
+
+# Finding employees by what they're like, e.g. everyone unhappy who hates
+# somebody on today's shift:
+#
+#     company.population.employees(
+#         disposition=(None, 0.0), hates=company.scheduled_today
+#     )
+#
+# Conditions are joined with "and". Ranges are `(low, high)`, including `low`
+# and excluding `high`, with `None` for no bound. Rather than scanning the
+# whole roster, a query starts from whichever index narrows it down the most
+# (sorted ages and wages, disposition buckets, or today's shift) and checks
+# the other conditions against only those rows. Traits are checked as bits of
+# the roster's trait column, and relationships last, against what's left.
+
+Range = tuple[Optional[float], Optional[float]]
+People = Union[Collection["Employee"], np.ndarray]
+
+
+class SortedIndex:
+    # A column's rows in order of their value; a range is a slice of them.
+
+    def __init__(self, values: np.ndarray):
+        self.order = np.argsort(values, kind="stable")
+        self.values = values[self.order]
+
+    def rows(self, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        start = 0 if low is None else np.searchsorted(self.values, low, "left")
+        end = (
+            len(self.values)
+            if high is None
+            else np.searchsorted(self.values, high, "left")
+        )
+        return self.order[start:end]
+
+
+class BucketIndex:
+    # A column's rows grouped into fixed-width buckets of value. Cheaper to
+    # rebuild than a `SortedIndex` (the bucket numbers are small integers,
+    # which NumPy sorts in linear time), which suits a column that changes
+    # every day. A range gives every row in the buckets it touches, so rows
+    # near its ends still have to be checked.
+
+    def __init__(self, values: np.ndarray, low: float, high: float, buckets: int):
+        self.low = low
+        self.width = (high - low) / buckets
+        self.buckets = buckets
+        codes = self._bucket(values)
+        self.order = np.argsort(codes, kind="stable")
+        self.starts = np.searchsorted(codes[self.order], np.arange(buckets + 3))
+
+    def rows(self, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        first = 0 if low is None else int(self._bucket(np.array([low]))[0])
+        last = (
+            self.buckets + 1 if high is None else int(self._bucket(np.array([high]))[0])
+        )
+        return self.order[self.starts[first] : self.starts[last + 1]]
+
+    def _bucket(self, values: np.ndarray) -> np.ndarray:
+        # Bucket 0 is everything below `low` and the last everything at or
+        # above `high`.
+        codes = np.floor((values - self.low) / self.width) + 1
+        return np.clip(codes, 0, self.buckets + 1).astype(np.uint8)
+
+
+class Population:
+    # Secondary indexes over a company's roster, each rebuilt the first time
+    # it's used after its column has changed.
+
+    def __init__(self, company: "Company"):
+        self.company = company
+        self.indexes: dict[str, tuple[tuple, Union[SortedIndex, BucketIndex]]] = {}
+
+    @property
+    def roster(self) -> Roster:
+        return self.company.roster
+
+    def employees(self, **conditions) -> list["Employee"]:
+        return list(self.roster.members[self.rows(**conditions)])
+
+    def count(self, **conditions) -> int:
+        return len(self.rows(**conditions))
+
+    def feuds(self, **conditions) -> tuple[np.ndarray, np.ndarray]:
+        # Pairs of rows `(i, j)` where `i` matches every condition and hates
+        # `j`, an active employee who dislikes them back.
+        return self.roster.relationships.mutual_hostility(
+            self.rows(**conditions), self.roster.column("active")
+        )
+
+    def rows(
+        self,
+        traits: int = 0,
+        without: int = 0,
+        age: Optional[Range] = None,
+        hourly_wage: Optional[Range] = None,
+        disposition: Optional[Range] = None,
+        scheduled: Optional[bool] = None,
+        available: Optional[bool] = None,
+        likes: Optional[People] = None,
+        dislikes: Optional[People] = None,
+        hates: Optional[People] = None,
+    ) -> np.ndarray:
+        # Roster rows of the employees matching every condition, in row order.
+        # `likes`, `dislikes` and `hates` match anyone who feels that way about
+        # at least one of the given employees (other than themselves).
+        roster = self.roster
+        ranges = {
+            "age": age,
+            "hourly_wage": hourly_wage,
+            "disposition_toward_company": disposition,
+        }
+        ranges = {name: r for name, r in ranges.items() if r is not None}
+
+        # Start from the smallest set of rows some condition allows.
+        candidates = None
+        if scheduled:
+            candidates = roster.rows_of(self.company.scheduled_today)
+        for name, (low, high) in ranges.items():
+            rows = self._index(name).rows(low, high)
+            if candidates is None or len(rows) < len(candidates):
+                candidates = rows
+        if candidates is None:
+            candidates = np.arange(roster.size)
+        candidates = np.sort(candidates)
+
+        # Then check every condition on just those rows.
+        keep = roster.active[candidates]
+        for name, (low, high) in ranges.items():
+            values = getattr(roster, name)[candidates]
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values < high
+        if traits or without:
+            codes = roster.traits[candidates]
+            keep &= ((codes & traits) == traits) & ((codes & without) == 0)
+        if available is not None:
+            keep &= roster.available[candidates] == available
+        if scheduled is False:
+            on_shift = np.zeros(roster.size, dtype=np.bool_)
+            on_shift[roster.rows_of(self.company.scheduled_today)] = True
+            keep &= ~on_shift[candidates]
+        candidates = candidates[keep]
+
+        for people, matches in [
+            (likes, lambda feelings: feelings > LIKES),
+            (dislikes, lambda feelings: feelings < DISLIKES),
+            (hates, lambda feelings: feelings < HATES),
+        ]:
+            if people is not None and len(candidates):
+                candidates = self._feeling(candidates, people, matches)
+        return candidates
+
+    def _feeling(self, candidates: np.ndarray, people: People, matches) -> np.ndarray:
+        roster = self.roster
+        if not isinstance(people, np.ndarray):
+            people = roster.rows_of(e for e in people if e._roster is roster)
+        feelings = roster.relationships.submatrix(candidates, people)
+        found = matches(feelings) & (candidates[:, None] != people[None, :])
+        return candidates[found.any(axis=1)]
+
+    def _index(self, name: str) -> Union[SortedIndex, BucketIndex]:
+        stamp = self.roster.stamp(name)
+        found = self.indexes.get(name)
+        if found is not None and found[0] == stamp:
+            return found[1]
+
+        values = self.roster.column(name)
+        if name == "disposition_toward_company":
+            index = BucketIndex(values, -1.0, 1.0, 20)
+        else:
+            index = SortedIndex(values)
+        self.indexes[name] = (stamp, index)
+        return index
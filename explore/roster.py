@@ -0,0 +1,438 @@
+from collections import defaultdict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from characters import Employee
+
+
+# How strongly an employee has to feel about someone to like, dislike or hate
+# them.
+LIKES = 0.5
+DISLIKES = -0.1
+HATES = -0.8
+
+
+class Roster:
+    # Per-employee state stored column-wise. Each hired employee owns one row;
+    # every column below is a NumPy array indexed by that row.
+    COLUMNS: dict[str, Any] = {
+        "returns_on_day": np.int32,  # See `LeaveCalendar`.
+        "available": np.bool_,
+        "desired_workdays_per_week": np.int32,
+        "weekly_hours_worked": np.int32,
+        "daily_punchcard": np.int32,
+        "hourly_wage": np.float64,
+        "disposition_toward_company": np.float64,
+        "active": np.bool_,
+        "traits": np.uint8,  # `Trait` bits.
+        "age": np.int32,
+    }
+
+    def __init__(self, capacity: int = 16):
+        self.capacity = capacity
+        self.size = 0  # Rows in use (high-water mark), including retired rows.
+        self.members = np.empty(capacity, dtype=object)
+        for name, dtype in Roster.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+        self.relationships = RelationshipMatrix()
+
+        # Bumped whenever rows are handed out or recycled, and per column
+        # whenever a single value is written through `RosterField` or
+        # `ColumnView`, so indexes over a column know when to rebuild. Code
+        # writing a column in bulk should call `changed`.
+        self.generation = 0
+        self.versions: defaultdict[str, int] = defaultdict(int)
+
+        self.free_rows: list[int] = []
+        # Rows of employees who have left, but whose hours still have to be
+        # paid out at the end of the week.
+        self.retired_rows: list[int] = []
+
+    def __len__(self) -> int:
+        return self.size - len(self.free_rows)
+
+    def __contains__(self, e: "Employee") -> bool:
+        return e._roster is self
+
+    def column(self, name: str) -> np.ndarray:
+        return getattr(self, name)[: self.size]
+
+    def changed(self, name: str):
+        self.versions[name] += 1
+
+    def stamp(self, name: str) -> tuple[int, int, int]:
+        # Changes whenever column `name` might have.
+        return self.size, self.generation, self.versions[name]
+
+    def with_traits(self, traits: int, without: int = 0) -> np.ndarray:
+        # Mask over the roster's rows of active employees who have all of
+        # `traits` and none of `without`, e.g. `with_traits(Trait.Old | Trait.Femm)`.
+        column = self.column("traits")
+        return (
+            self.column("active")
+            & ((column & traits) == traits)
+            & ((column & without) == 0)
+        )
+
+    def rows_of(self, employees) -> np.ndarray:
+        return np.fromiter((e._row for e in employees), dtype=np.intp)
+
+    def add(self, e: "Employee") -> int:
+        if e._roster is not None:
+            raise ValueError(f"{e.full_name()} is already on a roster")
+
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow(2 * self.capacity)
+            row = self.size
+            self.size += 1
+
+        # Move the employee's own values into the columns before binding.
+        self.hourly_wage[row] = e.hourly_wage
+        self.disposition_toward_company[row] = e.disposition_toward_company
+        self.traits[row] = e.traits
+        self.age[row] = e.age
+        self.active[row] = True
+        self.available[row] = True
+        self.members[row] = e
+        e._roster = self
+        e._row = row
+        self.generation += 1
+        return row
+
+    def retire(self, e: "Employee"):
+        self.active[e._row] = False
+        self.available[e._row] = False
+        self.retired_rows.append(e._row)
+
+    def recycle_retired_rows(self):
+        for row in self.retired_rows:
+            e = self.members[row]
+            # Hand the employee their values back before unbinding them.
+            wage = float(self.hourly_wage[row])
+            disposition = float(self.disposition_toward_company[row])
+            traits = e.traits
+            age = e.age
+            e._roster = None
+            e._row = -1
+            e.hourly_wage = wage
+            e.disposition_toward_company = disposition
+            e.traits = traits
+            e.age = age
+
+            self.members[row] = None
+            self.relationships.clear(row)
+            for name in Roster.COLUMNS:
+                getattr(self, name)[row] = 0
+            self.free_rows.append(row)
+        self.retired_rows.clear()
+        self.generation += 1
+
+    def _grow(self, capacity: int):
+        self.members = np.resize(self.members, capacity)
+        self.members[self.capacity :] = None
+        for name in Roster.COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: self.capacity] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+
+class RelationshipMatrix:
+    # How each employee (row) feels about each other employee (column), indexed
+    # by roster row. The matrix is stored as square float32 tiles that are only
+    # allocated once something is written to them, so reading never allocates
+    # and pairs who have never interacted cost nothing. Missing tiles read as 0.
+
+    TILE = 256
+
+    def __init__(self):
+        self.tiles: dict[tuple[int, int], np.ndarray] = {}
+        # Bumped for a tile whenever it might be written, so what's built from
+        # the tiles knows which parts to rebuild.
+        self.versions: defaultdict[tuple[int, int], int] = defaultdict(int)
+        # Changes waiting for the end of a `deferred` block, as
+        # `(rows, cols, deltas)` arrays.
+        self.pending: Optional[list[tuple[np.ndarray, ...]]] = None
+
+    def get(self, i: int, j: int) -> float:
+        tile = self.tiles.get((i // self.TILE, j // self.TILE))
+        if tile is None:
+            return 0.0
+        return float(tile[i % self.TILE, j % self.TILE])
+
+    def set(self, i: int, j: int, value: float):
+        # Anything deferred is applied first, so it isn't added on top later.
+        self.commit()
+        (bi, r), (bj, c) = divmod(i, self.TILE), divmod(j, self.TILE)
+        self._tile(bi, bj)[r, c] = value
+
+    def add(self, i: int, j: int, delta: float):
+        if self.pending is not None:
+            self.add_many(i, j, delta)
+            return
+        (bi, r), (bj, c) = divmod(i, self.TILE), divmod(j, self.TILE)
+        tile = self._tile(bi, bj)
+        # Added in double precision, like `add_many`.
+        tile[r, c] = float(tile[r, c]) + delta
+
+    def add_many(self, rows, cols, deltas):
+        # Adds `deltas[k]` to how `rows[k]` feels about `cols[k]`, for every
+        # `k`. Any of the three can be a single value to use for every `k`, so
+        # e.g. `add_many(rows, j, 0.1)` makes all of `rows` like `j` more.
+        # Repeated pairs add up.
+        rows, cols, deltas = np.broadcast_arrays(
+            np.asarray(rows, dtype=np.intp),
+            np.asarray(cols, dtype=np.intp),
+            np.asarray(deltas, dtype=np.float64),
+        )
+        rows, cols, deltas = rows.ravel(), cols.ravel(), deltas.ravel()
+        if self.pending is not None:
+            self.pending.append((rows.copy(), cols.copy(), deltas.copy()))
+            return
+        if len(rows) == 0:
+            return
+        if len(rows) <= 16:
+            # Not worth grouping by tile.
+            for i, j, delta in zip(rows.tolist(), cols.tolist(), deltas.tolist()):
+                self.add(i, j, delta)
+            return
+        bi, r = np.divmod(rows, self.TILE)
+        bj, c = np.divmod(cols, self.TILE)
+        # One `np.add.at` per tile touched.
+        blocks, which = np.unique((bi << 32) | bj, return_inverse=True)
+        order = np.argsort(which, kind="stable")
+        starts = np.searchsorted(which[order], np.arange(len(blocks) + 1))
+        for k, block in enumerate(blocks.tolist()):
+            sel = order[starts[k] : starts[k + 1]]
+            tile = self._tile(block >> 32, block & 0xFFFFFFFF)
+            np.add.at(tile, (r[sel], c[sel]), deltas[sel])
+
+    @contextmanager
+    def deferred(self):
+        # Holds back every `add` and `add_many` until the block ends, then
+        # applies them all at once. Reads inside the block don't see them.
+        if self.pending is not None:
+            yield
+            return
+        self.pending = []
+        try:
+            yield
+        finally:
+            self.commit()
+            self.pending = None
+
+    def commit(self):
+        # Applies whatever `deferred` has held back so far.
+        pending, self.pending = self.pending, None
+        if pending:
+            rows, cols, deltas = (np.concatenate(a) for a in zip(*pending))
+            self.add_many(rows, cols, deltas)
+        if pending is not None:
+            self.pending = []
+
+    def row(self, i: int, n: int) -> np.ndarray:
+        out = np.zeros(n, dtype=np.float32)
+        bi, r = divmod(i, self.TILE)
+        for bj in range(-(-n // self.TILE)):
+            tile = self.tiles.get((bi, bj))
+            if tile is not None:
+                start = bj * self.TILE
+                out[start : start + self.TILE] = tile[r, : n - start]
+        return out
+
+    def column(self, j: int, n: int) -> np.ndarray:
+        out = np.zeros(n, dtype=np.float32)
+        bj, c = divmod(j, self.TILE)
+        for bi in range(-(-n // self.TILE)):
+            tile = self.tiles.get((bi, bj))
+            if tile is not None:
+                start = bi * self.TILE
+                out[start : start + self.TILE] = tile[: n - start, c]
+        return out
+
+    def clear(self, i: int):
+        # Forget everything row/column `i` felt or was felt about.
+        b, k = divmod(i, self.TILE)
+        for (bi, bj), tile in self.tiles.items():
+            if bi == b:
+                tile[k, :] = 0
+            if bj == b:
+                tile[:, k] = 0
+            if b in (bi, bj):
+                self.versions[(bi, bj)] += 1
+
+    def submatrix(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        # How each of `rows` feels about each of `cols`, as a dense array.
+        out = np.zeros((len(rows), len(cols)), dtype=np.float32)
+        row_blocks, which = np.unique(rows // self.TILE, return_inverse=True)
+        col_blocks = cols // self.TILE
+        for bj in np.unique(col_blocks).tolist():
+            ci = np.flatnonzero(col_blocks == bj)
+            # The wanted columns of every row block's tile, stacked up.
+            parts = np.zeros((len(row_blocks), self.TILE, len(ci)), dtype=np.float32)
+            for k, bi in enumerate(row_blocks.tolist()):
+                tile = self.tiles.get((bi, bj))
+                if tile is not None:
+                    parts[k] = tile[:, cols[ci] % self.TILE]
+            out[:, ci] = parts[which, rows % self.TILE]
+        return out
+
+    def mutual_hostility(
+        self, haters: np.ndarray, hated: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # All pairs (i, j) where i hates j and j dislikes i back, for i among
+        # the sorted rows `haters` and j where the boolean mask `hated` holds.
+        # Only the haters' own rows of each tile are looked at.
+        blocks, starts = np.unique(haters // self.TILE, return_index=True)
+        by_block = dict(zip(blocks.tolist(), np.split(haters % self.TILE, starts[1:])))
+        found_i, found_j = [], []
+        for (bi, bj), tile in self.tiles.items():
+            rows = by_block.get(bi)
+            back = self.tiles.get((bj, bi))
+            if rows is None or back is None:
+                # No haters in block `bi`, or nobody in block `bj` has
+                # feelings about them.
+                continue
+            j0 = bj * self.TILE
+            cols = _padded(hated[j0 : j0 + self.TILE], self.TILE)
+            ii, jj = np.nonzero((tile[rows] < HATES) & cols[None, :])
+            ii = rows[ii]
+            mutual = back[jj, ii] < DISLIKES
+            if bi == bj:
+                mutual &= ii != jj
+            found_i.append(ii[mutual] + bi * self.TILE)
+            found_j.append(jj[mutual] + j0)
+
+        if not found_i:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        return np.concatenate(found_i), np.concatenate(found_j)
+
+    def _tile(self, bi: int, bj: int) -> np.ndarray:
+        # For writing: the tile is counted as changed.
+        block = (bi, bj)
+        tile = self.tiles.get(block)
+        if tile is None:
+            tile = np.zeros((self.TILE, self.TILE), dtype=np.float32)
+            self.tiles[block] = tile
+        self.versions[block] += 1
+        return tile
+
+
+def _padded(mask: np.ndarray, n: int) -> np.ndarray:
+    if len(mask) == n:
+        return mask
+    out = np.zeros(n, dtype=np.bool_)
+    out[: len(mask)] = mask
+    return out
+
+
+class RelationshipsView(MutableMapping):
+    # Dict-style access to one employee's row of the relationship matrix.
+    # Reading an entry never creates it.
+
+    def __init__(self, e: "Employee"):
+        self.e = e
+
+    def __getitem__(self, other: "Employee") -> float:
+        roster = self.e._roster
+        if roster is None or other._roster is not roster:
+            return 0.0
+        return roster.relationships.get(self.e._row, other._row)
+
+    def __setitem__(self, other: "Employee", value: float):
+        roster = self.e._roster
+        if roster is None or other._roster is not roster:
+            raise KeyError(other)
+        roster.relationships.set(self.e._row, other._row, value)
+
+    def __delitem__(self, other: "Employee"):
+        self[other] = 0.0
+
+    def _nonzero_rows(self) -> np.ndarray:
+        roster = self.e._roster
+        if roster is None:
+            return np.empty(0, dtype=np.intp)
+        feelings = roster.relationships.row(self.e._row, roster.size)
+        return np.flatnonzero((feelings != 0) & roster.column("active"))
+
+    def __iter__(self) -> Iterator["Employee"]:
+        for row in self._nonzero_rows():
+            yield self.e._roster.members[row]
+
+    def __len__(self) -> int:
+        return len(self._nonzero_rows())
+
+
+class RosterField:
+    # A dataclass field whose value lives in a roster column while the employee
+    # is on a roster, and on the instance otherwise. The dataclass `__init__`
+    # writes the initial value through `__set__`. Values read from the column
+    # are passed through `kind`, if given.
+
+    def __init__(self, default=None, kind=None):
+        self.default = default
+        self.kind = kind
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.attr = f"_{name}"
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self.default
+        roster = obj._roster
+        if roster is not None:
+            value = getattr(roster, self.name)[obj._row].item()
+            return value if self.kind is None else self.kind(value)
+        return obj.__dict__[self.attr]
+
+    def __set__(self, obj, value):
+        roster = obj._roster
+        if roster is not None:
+            getattr(roster, self.name)[obj._row] = value
+            roster.changed(self.name)
+        else:
+            obj.__dict__[self.attr] = value
+
+
+class ColumnView(MutableMapping):
+    # Dict-style access to one roster column, keyed by employee. Employees who
+    # aren't on the roster read as 0, like the `defaultdict(int)`s this replaces.
+
+    def __init__(self, roster: Roster, name: str):
+        self.roster = roster
+        self.name = name
+
+    def __getitem__(self, e: "Employee") -> int:
+        if e._roster is not self.roster:
+            return 0
+        return getattr(self.roster, self.name)[e._row].item()
+
+    def __setitem__(self, e: "Employee", value: int):
+        if e._roster is not self.roster:
+            raise KeyError(e)
+        getattr(self.roster, self.name)[e._row] = value
+        self.roster.changed(self.name)
+
+    def __delitem__(self, e: "Employee"):
+        self[e] = 0
+
+    def __iter__(self) -> Iterator["Employee"]:
+        for row in np.flatnonzero(self.roster.column(self.name)):
+            yield self.roster.members[row]
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.roster.column(self.name)))
+
+    def get(self, e: "Employee", default: Optional[int] = None):
+        return self[e] if e._roster is self.roster else default
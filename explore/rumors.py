@@ -0,0 +1,317 @@
+from collections import defaultdict
+import random
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from event_log import EventLog
+from person import Person
+from roster import Roster
+
+if TYPE_CHECKING:
+    from characters import Employee, Event
+
+# Word of what happened spreads from the people involved to the people they
+# like. Each rumor keeps how likely each employee is to have heard it, and
+# each step of spreading is, for every rumor at once, one pass over the
+# relationship graph:
+#
+#     heard[i] = 1 - (1 - heard[i]) * exp(-sum over j of SPREAD * likes(j, i) * heard[j])
+#
+# i.e. everyone who has heard tells the people they like, at a rate that grows
+# with how much they like them. This is worked out exactly rather than by
+# drawing who tells whom, so it doesn't touch the company's random streams.
+# Whoever's chance is at least `HEARD` counts as knowing. Chances below
+# `FAINT` are dropped, so only the (usually few) people who might have heard
+# are stored and each step follows just their edges.
+#
+# Only active employees hear anything, but anyone who knows keeps telling,
+# so e.g. someone who quit still spreads word of it from their last day. Rumors
+# involving someone whose row is handed back to the roster are forgotten along
+# with them.
+
+# Everyone on the roster an event names, as `(person id, roster row)` pairs.
+People = tuple[tuple[int, int], ...]
+
+
+class Rumors:
+    SPREAD = 0.5
+    HEARD = 0.5
+    STEPS_PER_DAY = 2
+    FAINT = 0.01
+
+    def __init__(self, roster: Roster, event_log: EventLog, days_kept: int = 7):
+        self.roster = roster
+        self.event_log = event_log
+        self.days_kept = days_kept
+        # Each rumor's event, as its day and place among that day's events in
+        # `event_log`, and who it involved (`None` once forgotten). Events are
+        # rebuilt from the log when asked for, so none are kept alive here.
+        # Rumors are numbered in the order they started; `days[0]` is rumor
+        # `first`.
+        self.days: list[int] = []
+        self.positions: list[int] = []
+        self.people: list[Optional[People]] = []
+        self.first = 0
+        # Who might have heard what, as parallel arrays of roster rows, rumor
+        # numbers, and chances of having heard.
+        self.rows = np.empty(0, dtype=np.intp)
+        self.rumors = np.empty(0, dtype=np.intp)
+        self.chances = np.empty(0, dtype=np.float64)
+        # Days whose events haven't been spread yet, as `(day, events)` with
+        # the people each event names and the rows of those who start out
+        # knowing it. Nothing is worked out until somebody asks who heard
+        # what, so a company nobody listens in on pays next to nothing.
+        self.backlog: list[
+            tuple[int, list[Optional[tuple[People, tuple[int, ...]]]]]
+        ] = []
+        # The edges out of each tile, and out of each block of rows, as last
+        # built along with the tile versions they were built from, so only
+        # tiles written since are looked at again.
+        self.tile_edges: dict[tuple[int, int], tuple[int, np.ndarray, ...]] = {}
+        self.block_edges: dict[int, tuple[tuple, np.ndarray, ...]] = {}
+
+    def __len__(self) -> int:
+        self._catch_up()
+        return len(self.days)
+
+    def end_of_day(self, events: list["Event"], day: int):
+        self.backlog.append((day, [self._involved(event) for event in events]))
+        # Rumors are independent of each other, so days whose rumors would be
+        # forgotten by now can be skipped altogether.
+        while self.backlog[0][0] <= day - self.days_kept:
+            self.backlog.pop(0)
+
+    def spread(self, steps: int = 1):
+        self._catch_up()
+        self._spread(self._edges(), steps)
+
+    def who_heard(self, event: "Event") -> list["Employee"]:
+        # Matched by value, the latest rumor first.
+        self._catch_up()
+        for k in reversed(range(self.first, self.first + len(self.days))):
+            if self._event(k) == event:
+                knows = self._knows() & (self.rumors == k)
+                return list(self.roster.members[np.sort(self.rows[knows])])
+        return []
+
+    def heard_by(self, e: "Employee") -> list["Event"]:
+        if e._roster is not self.roster:
+            return []
+        self._catch_up()
+        knows = self._knows() & (self.rows == e._row)
+        events = [self._event(k) for k in np.sort(self.rumors[knows]).tolist()]
+        return [event for event in events if event is not None]
+
+    def overheard(
+        self, rng: random.Random
+    ) -> Optional[tuple["Event", "Employee", "Employee"]]:
+        # A random rumor and two different people who've both heard it.
+        self._catch_up()
+        knows = self._knows()
+        counts = np.bincount(self.rumors[knows] - self.first, minlength=len(self.days))
+        candidates = np.flatnonzero(counts >= 2)
+        if len(candidates) == 0:
+            return None
+        k = self.first + int(candidates[rng.randrange(len(candidates))])
+        rows = np.sort(self.rows[knows & (self.rumors == k)])
+        i, j = rng.sample(range(len(rows)), 2)
+        event = self._event(k)
+        if event is None:
+            return None
+        members = self.roster.members
+        return event, members[rows[i]], members[rows[j]]
+
+    def forget(self, rows):
+        # Called with rows about to be handed back to the roster: their
+        # rumors, and whatever they'd heard, go with them.
+        rows = set(rows)
+        if not rows:
+            return
+        gone = []
+        for i, people in enumerate(self.people):
+            if people is not None and any(row in rows for _, row in people):
+                self.people[i] = None
+                gone.append(self.first + i)
+        for _, events in self.backlog:
+            for i, event in enumerate(events):
+                if event is not None and any(row in rows for _, row in event[0]):
+                    events[i] = None
+        if len(self.rows):
+            self._keep(~np.isin(self.rows, list(rows)) & ~np.isin(self.rumors, gone))
+
+    def _involved(self, event: "Event") -> tuple[People, tuple[int, ...]]:
+        # Everyone the event names, and the rows of those who took part.
+        people = tuple(
+            (p.id, p._row)
+            for p in vars(event).values()
+            if isinstance(p, Person) and p._roster is self.roster
+        )
+        rows = tuple(
+            p._row
+            for p in (getattr(event, name) for name in event.DIALOGUE.participants)
+            if p._roster is self.roster
+        )
+        return people, rows
+
+    def _event(self, k: int) -> Optional["Event"]:
+        # Rebuilds rumor `k`'s event from the log, or `None` if it's gone.
+        i = k - self.first
+        people = self.people[i]
+        if people is None:
+            return None
+        rows = dict(people)
+        members = self.roster.members
+
+        def resolve(person_id: int) -> Optional["Employee"]:
+            row = rows.get(person_id)
+            return None if row is None else members[row]
+
+        events = self.event_log.events_on(self.days[i], resolve)
+        if self.positions[i] >= len(events):
+            return None
+        return events[self.positions[i]]
+
+    def _knows(self) -> np.ndarray:
+        # Who has heard, among those still around to be asked.
+        return (self.chances >= self.HEARD) & self.roster.column("active")[self.rows]
+
+    def _keep(self, mask: np.ndarray):
+        self.rows = self.rows[mask]
+        self.rumors = self.rumors[mask]
+        self.chances = self.chances[mask]
+
+    def _catch_up(self):
+        if not self.backlog:
+            return
+        # Spread along today's relationships, even for past days.
+        edges = self._edges()
+        for day, events in self.backlog:
+            # Forget rumors older than `days_kept`, start one for each of the
+            # day's events, and let everything spread.
+            old = sum(1 for d in self.days if d <= day - self.days_kept)
+            if old:
+                del self.days[:old], self.positions[:old], self.people[:old]
+                self.first += old
+                self._keep(self.rumors >= self.first)
+
+            rows, rumors = [], []
+            for position, event in enumerate(events):
+                k = self.first + len(self.days)
+                people, started = event or (None, ())
+                self.days.append(day)
+                self.positions.append(position)
+                self.people.append(people)
+                rows.extend(started)
+                rumors.extend([k] * len(started))
+            self.rows = np.concatenate([self.rows, np.array(rows, dtype=np.intp)])
+            self.rumors = np.concatenate([self.rumors, np.array(rumors, dtype=np.intp)])
+            self.chances = np.concatenate([self.chances, np.ones(len(rows))])
+
+            self._spread(edges, self.STEPS_PER_DAY)
+        self.backlog.clear()
+
+    def _spread(self, edges: tuple[np.ndarray, ...], steps: int):
+        starts, dst, weights = edges
+        n = len(starts) - 1
+        if n == 0:
+            return
+        active = self.roster.column("active")
+        for _ in range(steps):
+            # Everyone who might have heard tells the people they like.
+            counts = starts[self.rows + 1] - starts[self.rows]
+            first = np.repeat(starts[self.rows] - np.cumsum(counts) + counts, counts)
+            out = first + np.arange(len(first))
+            told = weights[out] * np.repeat(self.chances, counts) * active[dst[out]]
+
+            # Add up what each (rumor, listener) pair is told, alongside what
+            # they'd heard already.
+            keys, which = np.unique(
+                np.concatenate(
+                    [
+                        self.rumors * n + self.rows,
+                        np.repeat(self.rumors, counts) * n + dst[out],
+                    ]
+                ),
+                return_inverse=True,
+            )
+            chances = np.zeros(len(keys))
+            np.maximum.at(chances, which[: len(self.rows)], self.chances)
+            told = np.bincount(
+                which[len(self.rows) :], weights=told, minlength=len(keys)
+            )
+            chances = 1 - (1 - chances) * np.exp(-told)
+
+            keep = chances >= self.FAINT
+            self.rumors, self.rows = np.divmod(keys[keep], n)
+            self.chances = chances[keep]
+
+    def _edges(self) -> tuple[np.ndarray, ...]:
+        # Who likes whom, grouped by the person doing the liking: where each
+        # row's edges start, the rows they like, and the rate news passes along
+        # each edge. Built a block of rows at a time, and only rebuilt for
+        # blocks with a tile written since.
+        matrix = self.roster.relationships
+        tile_size = matrix.TILE
+        n = self.roster.size
+        by_row = defaultdict(list)
+        for block in matrix.tiles:
+            by_row[block[0]].append(block)
+
+        counts = np.zeros(-(-n // tile_size) * tile_size, dtype=np.intp)
+        dst, weights = [], []
+        for bi in range(-(-n // tile_size)):
+            blocks = by_row.get(bi, [])
+            versions = tuple((block, matrix.versions.get(block, 0)) for block in blocks)
+            cached = self.block_edges.get(bi)
+            if cached is None or cached[0] != versions:
+                cached = self.block_edges[bi] = (versions, *self._block_edges(blocks))
+            _, block_counts, block_dst, block_weights = cached
+            counts[bi * tile_size : (bi + 1) * tile_size] = block_counts
+            dst.append(block_dst)
+            weights.append(block_weights)
+
+        starts = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(counts[:n], out=starts[1:])
+        if not dst:
+            return starts, np.empty(0, dtype=np.intp), np.empty(0)
+        return starts, np.concatenate(dst), np.concatenate(weights)
+
+    def _block_edges(self, blocks: list[tuple[int, int]]) -> tuple[np.ndarray, ...]:
+        # The edges out of one block of rows, from its tiles `blocks`: how many
+        # each row has, then their ends and rates in order of row.
+        matrix = self.roster.relationships
+        tile_size = matrix.TILE
+        src, dst, weights = [], [], []
+        for block in blocks:
+            version = matrix.versions.get(block, 0)
+            cached = self.tile_edges.get(block)
+            if cached is None or cached[0] != version:
+                # Flat indices are much quicker to find than (row, column) pairs.
+                tile = matrix.tiles[block].ravel()
+                found = np.flatnonzero(tile > 0)
+                r, c = np.divmod(found, tile_size)
+                cached = self.tile_edges[block] = (
+                    version,
+                    r,
+                    c + block[1] * tile_size,
+                    tile[found],
+                )
+            src.append(cached[1])
+            dst.append(cached[2])
+            weights.append(cached[3])
+        if not src:
+            return (
+                np.zeros(tile_size, dtype=np.intp),
+                np.empty(0, dtype=np.intp),
+                np.empty(0),
+            )
+
+        src = np.concatenate(src)
+        order = np.argsort(src, kind="stable")
+        weights = self.SPREAD * np.concatenate(weights).astype(np.float64)
+        return (
+            np.bincount(src, minlength=tile_size),
+            np.concatenate(dst)[order],
+            weights[order],
+        )
@@ -0,0 +1,61 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from characters import Company
+
+
+class SchedulingPolicy(ABC):
+    # Decides who, out of everyone who could work today, actually gets a shift.
+    #
+    # Policies only have to rank the candidates: everyone ranked 1.0 or higher
+    # needs today's shift and goes on it first, then the shift is filled from
+    # the highest ranked of the rest. Ties are broken by a draw from the
+    # company's RNG, so a given seed always gives the same schedule.
+
+    @abstractmethod
+    def priorities(self, company: "Company", rows: np.ndarray) -> np.ndarray:
+        pass
+
+    def choose(self, company: "Company", rows: np.ndarray) -> np.ndarray:
+        priorities = self.priorities(company, rows)
+        tie_breaks = company.np_rng.random(len(rows))
+
+        # Everyone who needs today's shift gets it, and otherwise about half of
+        # everyone available works, within the company's shift size limits.
+        needed = int(np.count_nonzero(priorities >= 1.0))
+        shift_size = max(needed, (len(rows) + 1) // 2, company.min_shift_size)
+        shift_size = min(shift_size, company.max_shift_size, len(rows))
+
+        # Highest priority first; `lexsort` sorts by its last key first.
+        ranking = np.lexsort((tie_breaks, -priorities))
+        return rows[ranking[:shift_size]]
+
+
+class NeediestFirst(SchedulingPolicy):
+    # Ranks people by how many of their remaining desired workdays they still
+    # need, relative to how many days are left in the week. Someone who has to
+    # work every remaining day to get their hours ranks 1.0.
+
+    def priorities(self, company: "Company", rows: np.ndarray) -> np.ndarray:
+        roster = company.roster
+        days_still_wanted = (
+            roster.desired_workdays_per_week[rows]
+            - roster.weekly_hours_worked[rows] / 8
+        )
+        days_left_in_week = 7 - company.day_of_week
+        return days_still_wanted / days_left_in_week
+
+
+class CheapestFirst(NeediestFirst):
+    # Still gives people who need today's shift their hours, but fills the rest
+    # of the shift with whoever has the lowest wage.
+
+    def priorities(self, company: "Company", rows: np.ndarray) -> np.ndarray:
+        needs = super().priorities(company, rows)
+        wages = company.roster.hourly_wage[rows]
+        # Map wages into [0, 1) so they never outrank someone who needs the shift.
+        cheapness = 1.0 / (1.0 + np.maximum(wages, 0.0))
+        return np.where(needs >= 1.0, needs, cheapness * 0.999)
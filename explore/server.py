@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+from typing import Callable, Optional
+
+from characters import (
+    Applicant,
+    Company,
+    end_day,
+    hiring_command,
+    parse_command,
+    play_events,
+    print_options,
+    run_command,
+    start_day,
+    start_hiring,
+)
+import streams
+from streams import Seed
+
+# Many games at once in one process, each played over its own connection to a
+# local socket:
+#
+#     python server.py --socket /tmp/company.sock
+#     nc -U /tmp/company.sock
+#
+# or all over stdin, one game per name, with each line naming its game:
+#
+#     python server.py
+#     alice employees
+#     bob talk Hank
+#     alice
+#
+# Every game takes the same commands as `characters.py`; "quit" ends one.
+# Commands are answered right away, but moving on to the next part of the day
+# (the day ticking) is queued and done by a single ticker, one game at a time
+# in the order they asked. A game waits for its tick before reading its next
+# command, so it never has more than one queued, and nobody waits behind more
+# than one tick of each other game. Everything runs in one event loop without
+# threads; the games' own code is unchanged and just has its printing
+# captured. A command or tick that fails is reported to its player, and the
+# game carries on.
+
+
+class Session:
+    def __init__(self, name: str, seed: Seed, send: Callable[[str], None]):
+        self.name = name
+        self.send = send
+        self.company = Company.generate(seed)
+        self.company.day_of_week = 5
+        self.inbox: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        # Whether the day's events are still to come.
+        self.morning = False
+        # The applicants, while in the hiring menu.
+        self.pool: Optional[list[Applicant]] = None
+        # Set by the server once the game is running.
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self, server: "Server"):
+        try:
+            self.send(self.captured(self.begin_day))
+        except Exception as e:
+            self.send(_error(e))
+        self.send(self.prompt())
+        while True:
+            line = await self.inbox.get()
+            if line is None or line.strip() == "quit":
+                return
+            try:
+                await self.handle(server, line)
+            except Exception as e:
+                self.send(
+                    _error(e) + ("> " if self.pool is not None else self.prompt())
+                )
+
+    async def handle(self, server: "Server", line: str):
+        if self.pool is not None:
+            out = self.captured(self.hiring, line)
+            self.send(out + ("> " if self.pool is not None else self.prompt()))
+            return
+
+        match parse_command(line.rstrip("\n")):
+            case ("continue", _):
+                self.send(await server.tick(self))
+            case ("hiring", _):
+                self.send(self.captured(self.start_hiring) + "> ")
+                return
+            case (command, name):
+                self.send(self.captured(run_command, self.company, command, name))
+        self.send(self.prompt())
+
+    def advance(self):
+        # The rest of the morning's or evening's part of the day, as in
+        # `characters.main`.
+        c = self.company
+        if self.morning:
+            play_events(c, print)
+            end_day(c)
+            self.morning = False
+        else:
+            if c.day_of_week == 0:
+                c.end_of_week().print()
+            self.begin_day()
+
+    def begin_day(self):
+        self.morning = start_day(self.company)
+        if not self.morning:
+            end_day(self.company)
+
+    def start_hiring(self):
+        self.pool = start_hiring(self.company)
+
+    def hiring(self, line: str):
+        if not hiring_command(self.company, self.pool, line.strip()):
+            self.pool = None
+
+    def prompt(self) -> str:
+        return self.captured(print_options) + "> "
+
+    def captured(self, f: Callable, *args) -> str:
+        # Nothing else runs until `f` returns, so its printing can't get mixed
+        # up with another game's.
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            f(*args)
+        return out.getvalue()
+
+
+class Server:
+    def __init__(self, seed: Seed = None):
+        # Each game's seed is split off the server's.
+        self.seeds = streams.seed_sequence(seed)
+        self.sessions: dict[str, Session] = {}
+        self.queue: asyncio.Queue[tuple[Session, asyncio.Future]] = asyncio.Queue()
+        self.ticker: Optional[asyncio.Task] = None
+        self.games: set[asyncio.Task] = set()
+        self.connections = 0
+
+    def open(self, name: str, send: Callable[[str], None]) -> Session:
+        if self.ticker is None:
+            self.ticker = asyncio.create_task(self.tick_forever())
+        session = Session(name, self.seeds.spawn(1)[0], send)
+        self.sessions[name] = session
+        task = session.task = asyncio.create_task(session.run(self))
+        self.games.add(task)
+        task.add_done_callback(lambda _: self.close(name, task))
+        return session
+
+    def close(self, name: str, task: asyncio.Task):
+        self.sessions.pop(name, None)
+        self.games.discard(task)
+
+    async def tick(self, session: Session) -> str:
+        # Waits for the session's turn and returns what its tick printed.
+        done = asyncio.get_running_loop().create_future()
+        await self.queue.put((session, done))
+        return await done
+
+    async def tick_forever(self):
+        while True:
+            session, done = await self.queue.get()
+            if not done.cancelled():
+                try:
+                    done.set_result(session.captured(session.advance))
+                except Exception as e:
+                    done.set_exception(e)
+            # Let input and output through between ticks.
+            await asyncio.sleep(0)
+
+    async def serve_socket(self, path: str):
+        async def connected(reader, writer):
+            self.connections += 1
+            name = f"connection {self.connections}"
+
+            def send(text: str):
+                if not writer.is_closing():
+                    writer.write(text.encode())
+
+            session = self.open(name, send)
+            # Hang up once the game is over, rather than leave the player
+            # typing at nobody.
+            session.task.add_done_callback(lambda _: writer.close())
+            try:
+                while line := await reader.readline():
+                    session.inbox.put_nowait(line.decode())
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            session.inbox.put_nowait(None)
+            writer.close()
+
+        # Room for hundreds of players connecting at once.
+        server = await asyncio.start_unix_server(connected, path, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdin(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+        )
+        while line := await reader.readline():
+            name, _, command = line.decode().rstrip("\n").partition(" ")
+            if not name:
+                continue
+            session = self.sessions.get(name)
+            if session is None:
+                session = self.open(name, _prefixed(name))
+                if not command:
+                    continue
+            session.inbox.put_nowait(command)
+        # Let every game finish what it was sent.
+        for session in list(self.sessions.values()):
+            session.inbox.put_nowait(None)
+        await asyncio.gather(*self.games)
+
+
+def _error(e: Exception) -> str:
+    return f"Something went wrong: {type(e).__name__}: {e}\n"
+
+
+def _prefixed(name: str) -> Callable[[str], None]:
+    # Marks each line of a game's output with its name.
+    def send(text: str):
+        lines = text.split("\n")
+        sys.stdout.write("".join(f"{name}| {line}\n" for line in lines if line))
+        sys.stdout.flush()
+
+    return send
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Host many games at once over a local socket or stdin."
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="listen on this Unix socket, one game per connection (default: stdin)",
+    )
+    parser.add_argument("--seed", type=int, help="master random seed")
+    args = parser.parse_args()
+
+    server = Server(args.seed)
+    if args.socket is not None:
+        asyncio.run(server.serve_socket(args.socket))
+    else:
+        asyncio.run(server.serve_stdin())
+
+
+if __name__ == "__main__":
+    main()
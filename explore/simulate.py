@@ -0,0 +1,212 @@
+import argparse
+from collections import Counter
+from dataclasses import dataclass, field
+import glob
+import os
+import time
+from typing import Optional
+
+from characters import (
+    Applicant,
+    Company,
+    Event,
+    WeeklyReport,
+    roll_event_kinds,
+)
+from metrics import Metrics
+import snapshot
+import streams
+from streams import Seed
+
+
+@dataclass
+class SimulationResult:
+    companies: list[Company]
+    days: int
+    elapsed_seconds: float
+    weekly_reports: list[WeeklyReport] = field(default_factory=list)
+    event_counts: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def company_days(self) -> int:
+        return len(self.companies) * self.days
+
+    @property
+    def company_days_per_second(self) -> float:
+        if self.elapsed_seconds == 0:
+            return float("inf")
+        return self.company_days / self.elapsed_seconds
+
+    def print(self):
+        print("SIMULATION")
+        print("----------")
+        print(f"Companies:          {len(self.companies):>10}")
+        print(f"Days:               {self.days:>10}")
+        print(f"Elapsed:            {self.elapsed_seconds:>10.3f}s")
+        print(f"Company-days/sec:   {self.company_days_per_second:>10.1f}")
+
+        if self.weekly_reports:
+            n = len(self.weekly_reports)
+            mean_pay = sum(r.total_pay for r in self.weekly_reports) / n
+            mean_hours = sum(r.total_labor_hours for r in self.weekly_reports) / n
+            mean_profit = sum(r.profit for r in self.weekly_reports) / n
+            losses = sum(1 for r in self.weekly_reports if r.profit < 0)
+            print()
+            print(f"Weeks:              {n:>10}")
+            print(f"Mean weekly hours:  {mean_hours:>10.1f}")
+            print(f"Mean weekly wages:  {mean_pay:>10.2f}")
+            print(f"Mean weekly profit: {mean_profit:>10.2f}")
+            print(f"Losing weeks:       {losses / n:>10.1%}")
+
+        headcounts = [len(c.employees) for c in self.companies]
+        print()
+        print(f"Final headcount:    {min(headcounts)}..{max(headcounts)}")
+
+        if self.event_counts:
+            print()
+            print("Events:")
+            for kind, count in self.event_counts.most_common():
+                print(f"\t{kind:<28}{count:>8}")
+
+
+def restaff(c: Company, min_headcount: int):
+    while len(c.employees) < min_headcount:
+        applicant = Applicant.generate(c.rng)
+        c.hire(
+            applicant.employee,
+            start_delay=applicant.start_delay,
+            desired_workdays=applicant.workdays,
+        )
+
+
+def tick(c: Company, event_counts: Optional[Counter[str]] = None):
+    c.start_of_day()
+    return finish_day(c, roll_event_kinds(c), event_counts)
+
+
+def finish_day(
+    c: Company,
+    event_kinds: list[type[Event]],
+    event_counts: Optional[Counter[str]] = None,
+) -> Optional[WeeklyReport]:
+    if c.scheduled_today:
+        for e in c.run_events(event_kinds):
+            if event_counts is not None:
+                event_counts[type(e).__name__] += 1
+
+    c.end_of_day()
+
+    if c.day_of_week == 0:
+        return c.end_of_week()
+
+
+def run_day(
+    companies: list[Company],
+    min_headcount: int = 0,
+    event_counts: Optional[Counter[str]] = None,
+) -> list[WeeklyReport]:
+    # One day for every company, returning the weeks that ended. Each company
+    # only ever draws from its own streams, so this is the same as `tick`ing
+    # them one by one.
+    reports = []
+    for c in companies:
+        if min_headcount:
+            restaff(c, min_headcount)
+        report = tick(c, event_counts)
+        if report is not None:
+            reports.append(report)
+    return reports
+
+
+def run(
+    n_companies: int,
+    n_days: int,
+    min_headcount: int = 0,
+    companies: Optional[list[Company]] = None,
+    seed: Seed = None,
+    metrics: Optional[Metrics] = None,
+) -> SimulationResult:
+    # Picks up `companies` where they left off if given, otherwise starts
+    # `n_companies` new ones, each with its own stream split off `seed`. With
+    # `metrics`, every company records its day loop there.
+    if companies is None:
+        companies = [Company.generate(s) for s in streams.spawn(seed, n_companies)]
+    if metrics is not None:
+        for c in companies:
+            c.metrics = metrics
+    result = SimulationResult(companies=companies, days=n_days, elapsed_seconds=0.0)
+
+    start = time.perf_counter()
+    for _ in range(n_days):
+        result.weekly_reports += run_day(companies, min_headcount, result.event_counts)
+    result.elapsed_seconds = time.perf_counter() - start
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run companies through the day loop without any prompts."
+    )
+    parser.add_argument("-c", "--companies", type=int, default=100)
+    parser.add_argument("-d", "--days", type=int, default=365)
+    parser.add_argument(
+        "--min-headcount",
+        type=int,
+        default=0,
+        help="hire applicants whenever a company drops below this many employees",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--resume",
+        metavar="DIR",
+        help="continue the companies saved in DIR instead of starting new ones",
+    )
+    parser.add_argument(
+        "--save", metavar="DIR", help="save every company to DIR when done"
+    )
+    parser.add_argument(
+        "--metrics", metavar="PATH", help="time each phase and write a JSON summary"
+    )
+    parser.add_argument(
+        "--prometheus",
+        metavar="PATH",
+        help="time each phase and write Prometheus text",
+    )
+    args = parser.parse_args()
+
+    companies = None
+    if args.resume is not None:
+        paths = sorted(glob.glob(os.path.join(args.resume, "company-*.snap")))
+        companies = [snapshot.load(path) for path in paths]
+
+    metrics = None
+    if args.metrics is not None or args.prometheus is not None:
+        metrics = Metrics()
+
+    result = run(
+        args.companies,
+        args.days,
+        min_headcount=args.min_headcount,
+        companies=companies,
+        seed=args.seed,
+        metrics=metrics,
+    )
+    result.print()
+
+    if metrics is not None:
+        print()
+        metrics.print()
+        if args.metrics is not None:
+            metrics.write_json(args.metrics)
+        if args.prometheus is not None:
+            metrics.write_prometheus(args.prometheus)
+
+    if args.save is not None:
+        os.makedirs(args.save, exist_ok=True)
+        for i, c in enumerate(result.companies):
+            snapshot.save(c, os.path.join(args.save, f"company-{i:05}.snap"))
+
+
+if __name__ == "__main__":
+    main()
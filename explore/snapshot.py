@@ -0,0 +1,300 @@
+import json
+import os
+import random
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+import characters
+from characters import Company, Employee
+from event_log import EventLog
+from indexed_set import IndexedSet
+from person import NicknamePool
+from roster import Roster
+import scheduling
+
+# A snapshot is one file:
+#
+#     magic (8 bytes) | version (u4) | header size (u4) | JSON header
+#     | padding | array | padding | array | ...
+#
+# The header holds the company's scalars, its RNG state and a table of the
+# arrays that follow (dtype, shape and offset from the start of the data). Every
+# array starts on an `ALIGN`-byte boundary, so a snapshot can be memory-mapped
+# and its arrays used in place. Strings (names and nicknames) are kept in one
+# table, itself an array of newline-separated UTF-8, and referred to by code.
+# Everything a company goes on to use is saved, including its rumors; only
+# caches (the rumors' edge lists, the name index) are left to be rebuilt.
+
+MAGIC = b"SILTSNAP"
+VERSION = 6
+ALIGN = 64
+PREFIX = np.dtype([("magic", "S8"), ("version", "<u4"), ("header_size", "<u4")])
+
+COMPANY_FIELDS = [
+    "day",
+    "day_of_week",
+    "min_shift_size",
+    "max_shift_size",
+    "hourly_wage",
+    "weekly_operating_expenses",
+    "hourly_revenue",
+    "understaffed",
+]
+NAME_FIELDS = ["first_name", "last_name", "middle_initial", "nickname"]
+
+
+def save(c: Company, path: str):
+    roster = c.roster
+    n = roster.size
+
+    # Names are stored as codes into one string table.
+    strings: dict[str, int] = {}
+    names = {name: np.full(n, -1, dtype=np.int32) for name in NAME_FIELDS}
+    ids = np.full(n, -1, dtype=np.int64)
+    for row, e in enumerate(roster.members[:n]):
+        if e is None:
+            continue
+        ids[row] = e.id
+        for name, codes in names.items():
+            value = getattr(e, name)
+            if value is not None:
+                codes[row] = strings.setdefault(value, len(strings))
+
+    pool = c.nicknames
+    used = np.array(
+        [strings.setdefault(name, len(strings)) for name in sorted(pool.used)],
+        dtype=np.int32,
+    )
+
+    rumors = c.rumors
+    blocks = list(roster.relationships.tiles)
+    tile = roster.relationships.TILE
+    arrays = {
+        **{f"roster/{name}": roster.column(name) for name in Roster.COLUMNS},
+        "roster/free_rows": np.array(roster.free_rows, dtype=np.int64),
+        "roster/retired_rows": np.array(roster.retired_rows, dtype=np.int64),
+        "people/id": ids,
+        **{f"people/{name}": codes for name, codes in names.items()},
+        "company/employees": roster.rows_of(c.employees),
+        "company/scheduled_today": roster.rows_of(c.scheduled_today),
+        "relationships/blocks": np.array(blocks, dtype=np.int64).reshape(-1, 2),
+        "relationships/tiles": (
+            np.stack([roster.relationships.tiles[b] for b in blocks])
+            if blocks
+            else np.zeros((0, tile, tile), dtype=np.float32)
+        ),
+        "events": c.event_log.to_rows(),
+        "nicknames/used": used,
+        "rumors/rows": rumors.rows,
+        "rumors/rumors": rumors.rumors,
+        "rumors/chances": rumors.chances,
+        "strings": np.frombuffer("\n".join(strings).encode(), dtype=np.uint8),
+    }
+
+    table = {}
+    offset = 0
+    for name, a in arrays.items():
+        offset = _aligned(offset)
+        table[name] = {
+            "dtype": np.lib.format.dtype_to_descr(a.dtype),
+            "shape": list(a.shape),
+            "offset": offset,
+        }
+        offset += a.nbytes
+
+    log = c.event_log
+    header = {
+        "company": {name: getattr(c, name) for name in COMPANY_FIELDS},
+        "scheduling_policy": type(c.scheduling_policy).__name__,
+        "rng": c.rng.getstate(),
+        "np_rng": c.np_rng.bit_generator.state,
+        "nicknames": {
+            "base": pool.base,
+            "free": pool.free,
+            "refills": pool.refills,
+        },
+        "roster": {"size": n},
+        "event_log": {
+            "kinds": [kind.__name__ for kind in log.kinds],
+            "texts": log.texts,
+            "today": log.today,
+            "retention_days": log.retention_days,
+            "spill_path": log.spill_path,
+        },
+        "rumors": {
+            "days_kept": rumors.days_kept,
+            "first": rumors.first,
+            "days": rumors.days,
+            "positions": rumors.positions,
+            "people": rumors.people,
+            "backlog": rumors.backlog,
+        },
+        "arrays": table,
+    }
+    header_bytes = json.dumps(header).encode()
+    prefix = np.array([(MAGIC, VERSION, len(header_bytes))], dtype=PREFIX)
+    data_start = _aligned(PREFIX.itemsize + len(header_bytes))
+
+    # Written to a temporary file and moved into place, so a crash never leaves
+    # half a snapshot behind, and anyone who has the old one mapped keeps it.
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as f:
+        f.write(prefix.tobytes())
+        f.write(header_bytes)
+        for name, a in arrays.items():
+            f.seek(data_start + table[name]["offset"])
+            f.write(np.ascontiguousarray(a).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(f.name, path)
+
+
+def read(path: str, mmap: bool = True) -> tuple[dict, dict[str, np.ndarray]]:
+    # Returns a snapshot's header and its arrays. With `mmap`, the arrays are
+    # copy-on-write views of the file: pages are read as they're touched and
+    # writing to them never changes the file.
+    if mmap:
+        buf = np.memmap(path, dtype=np.uint8, mode="c")
+    else:
+        buf = np.fromfile(path, dtype=np.uint8)
+    # Slicing a plain array is much cheaper than slicing a `memmap`, and the
+    # file stays mapped as long as anything views it.
+    buf = buf.view(np.ndarray)
+
+    prefix = buf[: PREFIX.itemsize].view(PREFIX)[0]
+    if prefix["magic"] != MAGIC:
+        raise ValueError(f"{path} is not a company snapshot")
+    if prefix["version"] != VERSION:
+        raise ValueError(f"{path} is snapshot version {prefix['version']}")
+
+    header_end = PREFIX.itemsize + int(prefix["header_size"])
+    header = json.loads(buf[PREFIX.itemsize : header_end].tobytes())
+    data_start = _aligned(header_end)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.lib.format.descr_to_dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        start = data_start + spec["offset"]
+        end = start + dtype.itemsize * int(np.prod(shape))
+        arrays[name] = buf[start:end].view(dtype).reshape(shape)
+    return header, arrays
+
+
+def load(path: str, mmap: bool = True) -> Company:
+    header, arrays = read(path, mmap)
+
+    n = header["roster"]["size"]
+    roster = Roster(capacity=max(16, n))
+    roster.size = n
+    for name in Roster.COLUMNS:
+        getattr(roster, name)[:n] = arrays[f"roster/{name}"]
+    roster.free_rows = arrays["roster/free_rows"].tolist()
+    roster.retired_rows = arrays["roster/retired_rows"].tolist()
+    # Tiles are used in place; they're only copied once something writes them.
+    roster.relationships.tiles = dict(
+        zip(
+            map(tuple, arrays["relationships/blocks"].tolist()),
+            arrays["relationships/tiles"],
+        )
+    )
+
+    # Code -1 (no name) picks the `None` on the end.
+    strings = np.array(
+        [*arrays["strings"].tobytes().decode().split("\n"), None], dtype=object
+    )
+    rows = np.flatnonzero(arrays["people/id"] >= 0)
+    ids = arrays["people/id"][rows].tolist()
+    names = [strings[arrays[f"people/{name}"][rows]].tolist() for name in NAME_FIELDS]
+    employees_by_id = {}
+    for row, person_id, first, last, middle, nickname in zip(
+        rows.tolist(), ids, *names
+    ):
+        # Built without `__init__`: the age, wage, disposition and traits
+        # already live in the roster columns.
+        e = Employee.__new__(Employee)
+        e.__dict__ = {
+            "first_name": first,
+            "last_name": last,
+            "middle_initial": middle,
+            "nickname": nickname,
+            "id": person_id,
+            "_roster": roster,
+            "_row": row,
+        }
+        employees_by_id[person_id] = e
+    roster.members[rows] = list(employees_by_id.values())
+
+    version, internal_state, gauss_next = header["rng"]
+    rng = random.Random()
+    rng.setstate((version, tuple(internal_state), gauss_next))
+    np_state = header["np_rng"]
+    np_rng = np.random.Generator(getattr(np.random, np_state["bit_generator"])())
+    np_rng.bit_generator.state = np_state
+
+    saved = header["event_log"]
+    event_log = EventLog(
+        [getattr(characters, kind) for kind in saved["kinds"]],
+        retention_days=saved["retention_days"],
+        spill_path=saved["spill_path"],
+    )
+    event_log.load_rows(
+        arrays["events"], saved["texts"], saved["today"], employees_by_id.get
+    )
+
+    c = Company(
+        employees=IndexedSet(roster.members[arrays["company/employees"]]),
+        scheduled_today=IndexedSet(roster.members[arrays["company/scheduled_today"]]),
+        event_log=event_log,
+        roster=roster,
+        scheduling_policy=getattr(scheduling, header["scheduling_policy"])(),
+        rng=rng,
+        np_rng=np_rng,
+        **header["company"],
+    )
+
+    saved = header["nicknames"]
+    c.nicknames = NicknamePool(saved["base"], rng=rng)
+    c.nicknames.used = set(strings[arrays["nicknames/used"]].tolist())
+    c.nicknames.free = saved["free"]
+    c.nicknames.refills = saved["refills"]
+
+    c.leave.rebuild(c.day)
+
+    for e in c.employees:
+        c.employees_by_first_name[e.first_name].add(e)
+    # Only needed to look people up by name, so only built once somebody does.
+    c.name_index.rebuild_from(lambda: c.employees)
+
+    saved = header["rumors"]
+    rumors = c.rumors
+    rumors.days_kept = saved["days_kept"]
+    rumors.first = saved["first"]
+    rumors.days = saved["days"]
+    rumors.positions = saved["positions"]
+    rumors.people = [_people(people) for people in saved["people"]]
+    rumors.backlog = [
+        (
+            day,
+            [
+                None if event is None else (_people(event[0]), tuple(event[1]))
+                for event in events
+            ],
+        )
+        for day, events in saved["backlog"]
+    ]
+    rumors.rows = np.array(arrays["rumors/rows"], dtype=np.intp)
+    rumors.rumors = np.array(arrays["rumors/rumors"], dtype=np.intp)
+    rumors.chances = np.array(arrays["rumors/chances"], dtype=np.float64)
+
+    return c
+
+
+def _people(people: Optional[list]) -> Optional[tuple]:
+    # JSON turns the rumors' `(id, row)` tuples into lists.
+    return None if people is None else tuple(map(tuple, people))
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGN) * ALIGN
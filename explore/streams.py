@@ -0,0 +1,34 @@
+import random
+from typing import Union
+
+import numpy as np
+
+# Every company draws from its own pair of random streams: a `random.Random`
+# for one-off draws and a NumPy `Generator` for vectorized ones. Both come from
+# one `SeedSequence`, so a company is reproducible from a single seed. A master
+# seed can be split with `spawn` into independent seeds for many companies or
+# worker processes.
+
+Seed = Union[int, np.random.SeedSequence, None]
+
+
+def seed_sequence(seed: Seed = None) -> np.random.SeedSequence:
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    # `None` seeds from the OS.
+    return np.random.SeedSequence(seed)
+
+
+def spawn(seed: Seed, n: int) -> list[np.random.SeedSequence]:
+    return seed_sequence(seed).spawn(n)
+
+
+def company_rngs(
+    seed: Seed = None,
+) -> tuple[random.Random, np.random.Generator]:
+    py_seed, np_seed = spawn(seed, 2)
+    state = py_seed.generate_state(4, dtype=np.uint64)
+    return (
+        random.Random(int.from_bytes(state.tobytes(), "little")),
+        np.random.default_rng(np_seed),
+    )
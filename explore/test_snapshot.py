@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from characters import Company
+from roster import Roster
+import simulate
+import snapshot
+
+
+def run(c: Company, days: int):
+    for _ in range(days):
+        simulate.restaff(c, 30)
+        simulate.tick(c)
+
+
+def state(c: Company) -> dict:
+    roster = c.roster
+    return {
+        "company": {name: getattr(c, name) for name in snapshot.COMPANY_FIELDS},
+        "columns": {name: roster.column(name).tolist() for name in Roster.COLUMNS},
+        "tiles": {
+            block: tile.tolist() for block, tile in roster.relationships.tiles.items()
+        },
+        "employees": [
+            (e.id, e._row, e.first_name, e.last_name, e.nickname) for e in c.employees
+        ],
+        "scheduled_today": [e.id for e in c.scheduled_today],
+        "events": c.event_log.to_rows().tobytes(),
+        "nicknames": sorted(c.nicknames.used),
+        "rumors": [
+            (e.id, [repr(event) for event in c.rumors.heard_by(e)]) for e in c.employees
+        ],
+        "rng": c.rng.getstate(),
+        "np_rng": c.np_rng.bit_generator.state,
+    }
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "company.snap")
+
+    def test_load_continues_the_same_run(self):
+        c = Company.generate(3)
+        run(c, 40)
+        snapshot.save(c, self.path)
+        saved = state(c)
+        run(c, 30)
+        expected = state(c)
+
+        for mmap in (True, False):
+            with self.subTest(mmap=mmap):
+                loaded = snapshot.load(self.path, mmap)
+                self.assertEqual(state(loaded), saved)
+                run(loaded, 30)
+                self.assertEqual(state(loaded), expected)
+
+    def test_load_finds_employees_by_name(self):
+        c = Company.generate(4)
+        run(c, 10)
+        snapshot.save(c, self.path)
+
+        loaded = snapshot.load(self.path)
+        e = next(iter(loaded.employees))
+        self.assertIs(loaded.roster.members[e._row], e)
+        for name in (e.first_name, e.last_name, e.full_name()):
+            self.assertEqual(
+                [o.id for o in loaded.name_index.find(name)],
+                [o.id for o in c.name_index.find(name)],
+            )
+        # Firing someone before the index is built leaves them out of it.
+        loaded.remove(e)
+        self.assertNotIn(e, loaded.name_index.find(e.full_name()))
+        self.assertEqual(len(loaded.name_index), len(loaded.employees))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,330 @@
+import argparse
+from collections import Counter
+from dataclasses import dataclass, field
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+from characters import Company
+from roster import Roster
+import simulate
+import streams
+from streams import Seed
+
+# Runs many companies at once across worker processes:
+#
+#     python world.py -c 5000 -d 365 --workers 8
+#
+# Each worker (a shard) builds and keeps its own slice of the companies, so no
+# `Company` or `Employee` is ever pickled; they're told how many days to run
+# and send back just the week totals and event counts. Every `sync_days` days
+# each shard also copies its companies' roster columns into a block of shared
+# memory the coordinator made for it, which the coordinator then reads in place
+# to add up headcounts, wages and dispositions across the whole world.
+#
+# The columns themselves stay in each shard's own rosters; only the copies are
+# shared. Companies get the same seeds as in `simulate.run` and only ever draw
+# from their own streams, so a run comes out the same as `simulate.run` with
+# the same seed, whatever the number of workers.
+
+
+class SharedTable:
+    # Roster columns of many companies, one company's rows after another, in
+    # shared memory. `company` is the world's index of each row's company.
+    FIELDS = {**Roster.COLUMNS, "company": np.int32}
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        # Makes a new block, or with `name`, opens one made elsewhere.
+        self.capacity = capacity
+        sizes = [_padded(capacity * np.dtype(t).itemsize) for t in self.FIELDS.values()]
+        if name is None:
+            self.shm = SharedMemory(create=True, size=max(sum(sizes), 1))
+        else:
+            self.shm = SharedMemory(name=name)
+        self.rows = 0
+        self.columns: dict[str, np.ndarray] = {}
+        offset = 0
+        for (column, dtype), size in zip(self.FIELDS.items(), sizes):
+            self.columns[column] = np.ndarray(
+                capacity, dtype=dtype, buffer=self.shm.buf, offset=offset
+            )
+            offset += size
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name][: self.rows]
+
+    def write(self, companies: list[Company], first: int):
+        # `first` is the world's index of `companies[0]`.
+        start = 0
+        for i, c in enumerate(companies, first):
+            end = start + c.roster.size
+            for name in Roster.COLUMNS:
+                self.columns[name][start:end] = c.roster.column(name)
+            self.columns["company"][start:end] = i
+            start = end
+        self.rows = start
+
+    def close(self):
+        # The arrays have to go before the memory they're in can.
+        self.columns.clear()
+        self.shm.close()
+
+
+@dataclass
+class Census:
+    # The whole world, counted by the coordinator from the shared tables.
+    day: int
+    headcounts: np.ndarray  # Per company.
+    mean_wage: float
+    mean_disposition: float
+    unhappy: float  # Share of employees who dislike the company.
+
+
+@dataclass
+class WorldResult:
+    companies: int
+    days: int
+    workers: int
+    elapsed_seconds: float
+    # Labor hours, wages and profit of every company-week that ended.
+    weeks: list[tuple[int, float, float]] = field(default_factory=list)
+    event_counts: Counter[str] = field(default_factory=Counter)
+    censuses: list[Census] = field(default_factory=list)
+
+    @property
+    def company_days_per_second(self) -> float:
+        if self.elapsed_seconds == 0:
+            return float("inf")
+        return self.companies * self.days / self.elapsed_seconds
+
+    def print(self):
+        print("WORLD")
+        print("-----")
+        print(f"Companies:          {self.companies:>10}")
+        print(f"Workers:            {self.workers:>10}")
+        print(f"Days:               {self.days:>10}")
+        print(f"Elapsed:            {self.elapsed_seconds:>10.3f}s")
+        print(f"Company-days/sec:   {self.company_days_per_second:>10.1f}")
+
+        if self.weeks:
+            hours, pay, profit = np.array(self.weeks).T
+            print()
+            print(f"Weeks:              {len(self.weeks):>10}")
+            print(f"Mean weekly hours:  {hours.mean():>10.1f}")
+            print(f"Mean weekly wages:  {pay.mean():>10.2f}")
+            print(f"Mean weekly profit: {profit.mean():>10.2f}")
+            print(f"Losing weeks:       {(profit < 0).mean():>10.1%}")
+
+        if self.censuses:
+            census = self.censuses[-1]
+            print()
+            print(
+                f"Final headcount:    "
+                f"{census.headcounts.min()}..{census.headcounts.max()}"
+            )
+            print(f"Employees:          {census.headcounts.sum():>10}")
+            print(f"Mean wage:          {census.mean_wage:>10.3f}")
+            print(f"Mean disposition:   {census.mean_disposition:>10.3f}")
+            print(f"Unhappy:            {census.unhappy:>10.1%}")
+
+        if self.event_counts:
+            print()
+            print("Events:")
+            for kind, count in self.event_counts.most_common():
+                print(f"\t{kind:<28}{count:>8}")
+
+
+class World:
+    def __init__(
+        self,
+        n_companies: int,
+        workers: int,
+        min_headcount: int = 0,
+        seed: Seed = None,
+    ):
+        self.n_companies = n_companies
+        company_seeds = streams.spawn(seed, n_companies)
+        self.shards = np.array_split(np.arange(n_companies), workers)
+        # Made before starting the workers, so they share the coordinator's
+        # tracker of shared memory, and whatever they open is cleaned up once
+        # the coordinator frees it.
+        self.tables = [SharedTable(16) for _ in self.shards]
+
+        self.connections: list[Connection] = []
+        self.processes: list[multiprocessing.Process] = []
+        for shard in self.shards:
+            here, there = multiprocessing.Pipe()
+            p = multiprocessing.Process(
+                target=_work,
+                args=(
+                    there,
+                    [company_seeds[i] for i in shard],
+                    int(shard[0]) if len(shard) else 0,
+                    min_headcount,
+                ),
+                daemon=True,
+            )
+            p.start()
+            self.connections.append(here)
+            self.processes.append(p)
+        self.day = 0
+
+    def __enter__(self) -> "World":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, n_days: int, sync_days: int = 7) -> WorldResult:
+        result = WorldResult(
+            companies=self.n_companies,
+            days=n_days,
+            workers=len(self.processes),
+            elapsed_seconds=0.0,
+        )
+        start = time.perf_counter()
+        left = n_days
+        while left:
+            days = min(sync_days, left)
+            for conn in self.connections:
+                conn.send(("run", days))
+            for k, conn in enumerate(self.connections):
+                rows, counts, weeks = conn.recv()
+                result.event_counts += counts
+                result.weeks += weeks
+                if self.tables[k].capacity < rows:
+                    # The shard lets go of its old table before it's unlinked.
+                    conn.send(("drop",))
+                    conn.recv()
+                    _free(self.tables[k])
+                    self.tables[k] = SharedTable(2 * rows)
+            left -= days
+            self.day += days
+            result.censuses.append(self.census())
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+    def census(self) -> Census:
+        # Has every shard copy its columns out, then counts them up in place.
+        for conn, table in zip(self.connections, self.tables):
+            conn.send(("publish", table.name, table.capacity))
+        headcounts = np.zeros(self.n_companies, dtype=np.int64)
+        wages, dispositions, unhappy, employees = 0.0, 0.0, 0, 0
+        for conn, table in zip(self.connections, self.tables):
+            table.rows = conn.recv()
+            active = table.column("active")
+            headcounts += np.bincount(
+                table.column("company")[active], minlength=self.n_companies
+            )
+            disposition = table.column("disposition_toward_company")[active]
+            wages += float(table.column("hourly_wage")[active].sum())
+            dispositions += float(disposition.sum())
+            unhappy += int((disposition < 0).sum())
+            employees += int(active.sum())
+        employees = max(employees, 1)
+        return Census(
+            day=self.day,
+            headcounts=headcounts,
+            mean_wage=wages / employees,
+            mean_disposition=dispositions / employees,
+            unhappy=unhappy / employees,
+        )
+
+    def close(self):
+        for conn in self.connections:
+            conn.send(None)
+        for p in self.processes:
+            p.join()
+        for table in self.tables:
+            _free(table)
+        self.tables = []
+
+
+def _work(
+    conn: Connection,
+    seeds: list[np.random.SeedSequence],
+    first: int,
+    min_headcount: int,
+):
+    # A shard: its companies live here for the whole run.
+    companies = [Company.generate(s) for s in seeds]
+    table = None
+    while (message := conn.recv()) is not None:
+        match message:
+            case ("run", days):
+                counts: Counter[str] = Counter()
+                weeks = []
+                for _ in range(days):
+                    for r in simulate.run_day(companies, min_headcount, counts):
+                        weeks.append((r.total_labor_hours, r.total_pay, r.profit))
+                conn.send((sum(c.roster.size for c in companies), counts, weeks))
+            case ("publish", name, capacity):
+                if table is None or table.name != name:
+                    if table is not None:
+                        table.close()
+                    table = SharedTable(capacity, name)
+                table.write(companies, first)
+                conn.send(table.rows)
+            case ("drop",):
+                if table is not None:
+                    table.close()
+                    table = None
+                conn.send(None)
+    if table is not None:
+        table.close()
+
+
+def _free(table: SharedTable):
+    table.close()
+    table.shm.unlink()
+
+
+def _padded(n: int) -> int:
+    # Keeps every column 8-byte aligned.
+    return -(-n // 8) * 8
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run companies through the day loop across worker processes."
+    )
+    parser.add_argument("-c", "--companies", type=int, default=1000)
+    parser.add_argument("-d", "--days", type=int, default=365)
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="worker processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--min-headcount",
+        type=int,
+        default=0,
+        help="hire applicants whenever a company drops below this many employees",
+    )
+    parser.add_argument(
+        "--sync-days",
+        type=int,
+        default=7,
+        help="days between counting up the whole world",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    with World(args.companies, args.workers, args.min_headcount, args.seed) as world:
+        result = world.run(args.days, args.sync_days)
+    result.print()
+
+
+if __name__ == "__main__":
+    main()